@@ -0,0 +1,106 @@
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+
+def run_case(v0, angle, dt, m, S, max_points):
+    # Импорт внутри функции: lab1code сам импортирует этот модуль
+    from lab1code import FlightSimulator
+    return FlightSimulator().simulate(v0, angle, dt, m, S, max_points=max_points)
+
+
+def observed_order(dts, values):
+    # Порядок сходимости по трём последовательным шагам с одинаковым отношением r:
+    # p = log(|R1 - R2| / |R2 - R3|) / log(r), уточнение R = R3 + (R3 - R2) / (r^p - 1)
+    estimates = []
+    for i in range(len(dts) - 2):
+        r = dts[i] / dts[i + 1]
+        if not math.isclose(r, dts[i + 1] / dts[i + 2]):
+            continue
+        d1 = values[i] - values[i + 1]
+        d2 = values[i + 1] - values[i + 2]
+        if d1 == 0 or d2 == 0 or d1 / d2 <= 0:
+            continue
+        p = math.log(d1 / d2) / math.log(r)
+        extrapolated = values[i + 2] + (values[i + 2] - values[i + 1]) / (r**p - 1)
+        estimates.append((dts[i + 2], p, extrapolated))
+    return estimates
+
+
+class ConvergenceStudy:
+    # Расчёты simulate для набора dt в пуле процессов. Результаты кэшируются по
+    # (v0, angle, dt, m, S) и отдаются через on_result(dt, result, error) по мере
+    # готовности. Колбэки вызываются из потока пула: GUI должен передать их в root.after
+    # и сверить run_id, который вернул run, с текущим — после cancel или нового
+    # запуска старые результаты отбрасываются.
+    def __init__(self, workers=None, max_points=2000):
+        self.workers = workers
+        self.max_points = max_points
+        self.pool = None
+        self.cache = {}
+        self.run_id = 0
+        self.futures = []
+        self.lock = threading.Lock()
+
+    def run(self, v0, angle, dts, m, S, on_result, on_done=None):
+        self.cancel()
+        run_id = self.run_id
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+        results = {}
+        failed = []
+
+        def finish(dt, result, error):
+            # Кэшированные случаи приходят из основного потока, посчитанные —
+            # из потока пула, поэтому счётчик готовых меняется под замком
+            if run_id != self.run_id:
+                return
+            with self.lock:
+                if error is None:
+                    results[dt] = result
+                else:
+                    failed.append(dt)
+                finished = len(results) + len(failed) == len(dts)
+            on_result(dt, result, error)
+            if on_done is not None and finished:
+                # Порядок считается только по полному набору шагов
+                ranges = [results[d]['range'] for d in dts] if not failed else []
+                on_done(results, observed_order(dts, ranges) if ranges else [])
+
+        # Самые дорогие (мелкий шаг) отправляются первыми
+        for dt in sorted(dts):
+            key = (v0, angle, dt, m, S)
+            if key in self.cache:
+                finish(dt, self.cache[key], None)
+                continue
+
+            future = self.pool.submit(run_case, v0, angle, dt, m, S, self.max_points)
+            future.add_done_callback(lambda f, dt=dt, key=key: self.collect(f, dt, key, finish))
+            self.futures.append(future)
+        return run_id
+
+    def collect(self, future, dt, key, finish):
+        if future.cancelled():
+            return
+        try:
+            result = future.result()
+        except Exception as e:
+            finish(dt, None, f"{type(e).__name__}: {e}")
+            return
+        self.cache[key] = result
+        finish(dt, result, None)
+
+    def cancel(self):
+        # Ожидающие расчёты снимаются, результаты идущих будут отброшены
+        self.run_id += 1
+        for future in self.futures:
+            future.cancel()
+        self.futures = []
+
+    def close(self):
+        self.cancel()
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
@@ -1,14 +1,77 @@
+import math
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 import tkinter as tk
 from tkinter import ttk, messagebox
+from convergence import ConvergenceStudy
 
 G = 9.81 
 RHO_0 = 1.225  
 C = 0.15 
 
+
+# Метод Дормана-Принса 5(4): узлы, коэффициенты стадий, веса решения 5-го порядка,
+# разность весов 5-го и 4-го порядков (оценка ошибки) и плотный вывод 4-го порядка
+DP_C = [0, 1/5, 3/10, 4/5, 8/9, 1]
+DP_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+]
+DP_B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84])
+DP_E = np.array([-71/57600, 0, 71/16695, -71/1920, 17253/339200, -22/525, 1/40])
+DP_P = np.array([
+    [1, -8048581381/2820520608, 8663915743/2820520608, -12715105075/11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200/32700410799, -68118460800/10900136933, 87487479700/32700410799],
+    [0, -1754552775/470086768, 14199869525/1410260304, -10690763975/1880347072],
+    [0, 127303824393/49829197408, -318862633887/49829197408, 701980252875/199316789632],
+    [0, -282668133/205662961, 2019193451/616988883, -1453857185/822651844],
+    [0, 40617522/29380423, -110615467/29380423, 69997945/29380423],
+])
+
+
+def find_root(f, a, b, tol=1e-15):
+    # Корень f на [a, b] при f(a) и f(b) разных знаков (метод Иллинойса)
+    fa, fb = f(a), f(b)
+    if fa == 0:
+        return a
+    side = 0
+    while b - a > tol:
+        c = (a * fb - b * fa) / (fb - fa)
+        if not a < c < b:
+            c = (a + b) / 2
+        fc = f(c)
+        if fc == 0:
+            return c
+        if (fc > 0) == (fb > 0):
+            b, fb = c, fc
+            if side == -1:
+                fa /= 2
+            side = -1
+        else:
+            a, fa = c, fc
+            if side == 1:
+                fb /= 2
+            side = 1
+    return (a + b) / 2
+
+
+def decimate(x, y, max_points):
+    # Прореживание траектории для графика: каждая k-я точка и обязательно последняя
+    n = len(x)
+    if max_points is None or n <= max_points:
+        return x, y
+    idx = np.arange(0, n, math.ceil(n / max_points))
+    if idx[-1] != n - 1:
+        idx = np.append(idx, n - 1)
+    return x[idx], y[idx]
+
 class FlightSimulator:
     def __init__(self):
         self.state = {}
@@ -38,29 +101,213 @@ class FlightSimulator:
         delta = (k1 + 2*k2 + 2*k3 + k4) * dt / 6
 
         return x + delta[0], y + delta[1], vx + delta[2], vy + delta[3]
+
+    def get_derivatives_batch(self, state, k):
+        # То же для массива состояний (N, 4), k — коэффициент сопротивления каждого тела
+        vx = state[:, 2]
+        vy = state[:, 3]
+        v = np.sqrt(vx**2 + vy**2)
+
+        deriv = np.empty_like(state)
+        deriv[:, 0] = vx
+        deriv[:, 1] = vy
+        deriv[:, 2] = -k * vx * v
+        deriv[:, 3] = -G - k * vy * v
+        return deriv
+
+    def simulate_batch(self, v0, angle, dt, m=1.0, S=0.01):
+        # Много траекторий сразу: v0, angle, m, S — числа или массивы одной формы.
+        # Упавшие тела исключаются из расчёта, остальные шагают RK4 вместе.
+        v0, angle, m, S = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (v0, angle, m, S)))
+        shape = v0.shape
+        n = v0.size
+
+        angle_rad = np.radians(angle.ravel())
+        state = np.zeros((n, 4))
+        state[:, 2] = v0.ravel() * np.cos(angle_rad)
+        state[:, 3] = v0.ravel() * np.sin(angle_rad)
+        k_all = 0.5 * C * RHO_0 * S.ravel() / m.ravel()
+
+        max_h = np.zeros(n)
+        flight_range = np.zeros(n)
+        final_v = np.zeros(n)
+        steps = np.zeros(n, dtype=np.int64)
+
+        active = np.arange(n)
+        step = 0
+        while len(active):
+            s = state[active]
+            k = k_all[active]
+
+            k1 = self.get_derivatives_batch(s, k)
+            k2 = self.get_derivatives_batch(s + k1 * dt / 2, k)
+            k3 = self.get_derivatives_batch(s + k2 * dt / 2, k)
+            k4 = self.get_derivatives_batch(s + k3 * dt, k)
+            s = s + (k1 + 2*k2 + 2*k3 + k4) * dt / 6
+            step += 1
+
+            landed = s[:, 1] < 0
+            flying = active[~landed]
+            max_h[flying] = np.maximum(max_h[flying], s[~landed, 1])
+            state[flying] = s[~landed]
+
+            done = active[landed]
+            flight_range[done] = s[landed, 0]
+            final_v[done] = np.sqrt(s[landed, 2]**2 + s[landed, 3]**2)
+            steps[done] = step
+
+            active = flying
+
+        return {
+            'range': flight_range.reshape(shape),
+            'max_height': max_h.reshape(shape),
+            'final_velocity': final_v.reshape(shape),
+            'time': (steps * dt).reshape(shape),
+            'dt': dt
+        }
+
+    def launch_envelope(self, v0s, angles, dt, m=1.0, S=0.01):
+        # Таблицы дальности и высоты: строки — скорости, столбцы — углы
+        v0_grid, angle_grid = np.meshgrid(v0s, angles, indexing='ij')
+        return self.simulate_batch(v0_grid, angle_grid, dt, m, S)
     
-    def simulate(self, v0, angle, dt, m=1.0, S=0.01):
+    def simulate(self, v0, angle, dt, m=1.0, S=0.01, max_points=None):
+        # Тот же RK4, что в step_rk4, но на обычных float без временных массивов.
+        # Точки пишутся в буферы, которые растут вдвое при заполнении.
         angle_rad = np.radians(angle)
 
-        t, x, y = 0, 0.0, 0.0
-        vx = v0 * np.cos(angle_rad)
-        vy = v0 * np.sin(angle_rad)
+        x, y = 0.0, 0.0
+        vx = float(v0 * np.cos(angle_rad))
+        vy = float(v0 * np.sin(angle_rad))
+        k = 0.5 * C * RHO_0 * S / m
 
-        traj_x, traj_y = [x], [y]
+        # Начальный размер — по времени полёта без сопротивления
+        size = max(1024, int(2 * abs(vy) / G / dt) + 2)
+        traj_x = np.empty(size)
+        traj_y = np.empty(size)
+        traj_x[0], traj_y[0] = x, y
+        n = 1
         max_h = 0.0
 
         while y >= 0:
-            x, y, vx, vy = self.step_rk4(x, y, vx, vy, dt, m, S)
-            t += dt
+            v = math.sqrt(vx*vx + vy*vy)
+            ax1, ay1 = -k * vx * v, -G - k * vy * v
 
-            if y >= 0:
-                traj_x.append(x)
-                traj_y.append(y)
-                max_h = max(max_h, y)
+            vx2, vy2 = vx + ax1 * dt / 2, vy + ay1 * dt / 2
+            v = math.sqrt(vx2*vx2 + vy2*vy2)
+            ax2, ay2 = -k * vx2 * v, -G - k * vy2 * v
+
+            vx3, vy3 = vx + ax2 * dt / 2, vy + ay2 * dt / 2
+            v = math.sqrt(vx3*vx3 + vy3*vy3)
+            ax3, ay3 = -k * vx3 * v, -G - k * vy3 * v
+
+            vx4, vy4 = vx + ax3 * dt, vy + ay3 * dt
+            v = math.sqrt(vx4*vx4 + vy4*vy4)
+            ax4, ay4 = -k * vx4 * v, -G - k * vy4 * v
+
+            x = x + (vx + 2*vx2 + 2*vx3 + vx4) * dt / 6
+            y = y + (vy + 2*vy2 + 2*vy3 + vy4) * dt / 6
+            vx, vy = (vx + (ax1 + 2*ax2 + 2*ax3 + ax4) * dt / 6,
+                      vy + (ay1 + 2*ay2 + 2*ay3 + ay4) * dt / 6)
 
-        final_v = np.sqrt(vx**2 + vy**2)
+            if y >= 0:
+                if n == size:
+                    traj_x = np.concatenate([traj_x, np.empty(size)])
+                    traj_y = np.concatenate([traj_y, np.empty(size)])
+                    size *= 2
+                traj_x[n] = x
+                traj_y[n] = y
+                n += 1
+                if y > max_h:
+                    max_h = y
+
+        final_v = math.sqrt(vx*vx + vy*vy)
+        traj_x, traj_y = decimate(traj_x[:n], traj_y[:n], max_points)
         return {'x': traj_x, 'y': traj_y, 'range': x, 'max_height': max_h, 'final_velocity': final_v, 'dt': dt}
 
+    def simulate_adaptive(self, v0, angle, m=1.0, S=0.01, rtol=1e-8, atol=1e-10, points_per_step=8):
+        # Адаптивный шаг Дормана-Принса с контролем ошибки. Момент падения (y = 0)
+        # и вершина (vy = 0) ищутся как корни плотного вывода внутри шага,
+        # поэтому дальность не зависит от того, где закончился последний шаг.
+        angle_rad = np.radians(angle)
+        state = np.array([0.0, 0.0, v0 * np.cos(angle_rad), v0 * np.sin(angle_rad)])
+        nfev = 0
+
+        def f(s):
+            nonlocal nfev
+            nfev += 1
+            return self.get_derivatives(s, None, m, S)
+
+        def error_norm(e, s_old, s_new):
+            scale = atol + rtol * np.maximum(np.abs(s_old), np.abs(s_new))
+            return np.sqrt(np.mean((e / scale)**2))
+
+        # Начальный шаг по алгоритму Хайрера
+        f0 = f(state)
+        scale = atol + rtol * np.abs(state)
+        d0, d1 = np.sqrt(np.mean((state / scale)**2)), np.sqrt(np.mean((f0 / scale)**2))
+        h = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+        d2 = np.sqrt(np.mean(((f(state + h * f0) - f0) / scale)**2)) / h
+        h = min(100 * h, (0.01 / max(d1, d2))**(1 / 5) if max(d1, d2) > 1e-15 else max(1e-6, h * 1e-3))
+
+        t = 0.0
+        traj_x, traj_y = [0.0], [0.0]
+        max_h = 0.0
+        steps = 0
+        K = np.empty((7, 4))
+        K[0] = f0
+
+        while True:
+            for i in range(1, 6):
+                K[i] = f(state + h * np.dot(DP_A[i], K[:i]))
+            new = state + h * (DP_B @ K[:6])
+            K[6] = f(new)
+
+            err = error_norm(h * (DP_E @ K), state, new)
+            if err > 1:
+                h *= max(0.2, 0.9 * err**(-1 / 5))
+                continue
+
+            steps += 1
+            Q = K.T @ DP_P
+
+            def dense(theta, s=state, h=h, Q=Q):
+                return s + h * (Q @ (theta ** np.arange(1, 5)))
+
+            if state[3] > 0 >= new[3]:
+                theta = find_root(lambda th: dense(th)[3], 0.0, 1.0)
+                max_h = max(max_h, dense(theta)[1])
+
+            if new[1] < 0:
+                theta = find_root(lambda th: dense(th)[1], 0.0, 1.0)
+                impact = dense(theta)
+                for th in np.linspace(0, theta, points_per_step + 1)[1:-1]:
+                    p = dense(th)
+                    traj_x.append(p[0])
+                    traj_y.append(p[1])
+                traj_x.append(impact[0])
+                traj_y.append(0.0)
+                t += theta * h
+                break
+
+            for th in np.linspace(0, 1, points_per_step + 1)[1:]:
+                p = dense(th)
+                traj_x.append(p[0])
+                traj_y.append(p[1])
+            max_h = max(max_h, new[1])
+
+            t += h
+            state = new
+            K[0] = K[6]
+            h *= min(10.0, 0.9 * err**(-1 / 5)) if err > 0 else 10.0
+
+        return {
+            'x': np.array(traj_x), 'y': np.array(traj_y),
+            'range': impact[0], 'max_height': max_h,
+            'final_velocity': np.sqrt(impact[2]**2 + impact[3]**2),
+            'time': t, 'steps': steps, 'nfev': nfev, 'rtol': rtol
+        }
+
     def start_step_simulation(self, v0, angle, dt, m=1.0, S=0.01):
         angle_rad = np.radians(angle)
         self.state = {
@@ -97,6 +344,8 @@ class SimulationApp:
         self.root.geometry("1200x800")
 
         self.simulator = FlightSimulator()
+        self.study = ConvergenceStudy()
+        self.pending_rows = {}  # строки таблицы, ждущие результата из пула
         self.results = []
 
         self.is_animating = False
@@ -255,6 +504,9 @@ class SimulationApp:
 
     def clear_all(self):
         self.stop_animation()
+        # Расчёты таблицы, не успевшие закончиться, больше не нужны
+        self.study.cancel()
+        self.pending_rows = {}
         self.results = []
         self.ax.clear()
         self.setup_plot()
@@ -269,33 +521,78 @@ class SimulationApp:
             angle = float(self.angle_entry.get())
             m = float(self.m_entry.get())
             S = float(self.s_entry.get())
+        except ValueError:
+            messagebox.showerror("Ошибка")
+            return
 
-            steps = [1, 0.1, 0.01, 0.001, 0.0001]
-            colors = plt.cm.viridis(np.linspace(0, 1, len(steps)))
-
-            for i, dt in enumerate(steps):
-                result = self.simulator.simulate(v0, angle, dt, m, S)
-                self.results.append(result)
-
-                self.ax.plot(result['x'], result['y'], 
-                            linewidth=2,
-                            color=colors[i])
+        steps = [1, 0.1, 0.01, 0.001, 0.0001]
+        colors = dict(zip(steps, plt.cm.viridis(np.linspace(0, 1, len(steps)))))
+
+        # Прошлый запуск отменяется в study.run, его незаполненные строки уже не дождутся результата
+        for dt, row in self.pending_rows.items():
+            self.tree.item(row, values=(f"{dt}", "отменён", "—", "—"))
+
+        # Строки заполняются по мере готовности расчётов в пуле процессов
+        rows = {dt: self.tree.insert('', tk.END, values=(f"{dt}", "…", "…", "…")) for dt in steps}
+        self.pending_rows = dict(rows)
+
+        def show_result(dt, result, error):
+            if run_id != self.study.run_id:
+                return
+            self.pending_rows.pop(dt, None)
+            if error is not None:
+                self.tree.item(rows[dt], values=(f"{dt}", "ошибка", "—", "—"))
+                messagebox.showerror("Ошибка расчёта", f"dt={dt}: {error}")
+                return
+            self.results.append(result)
+            self.ax.plot(result['x'], result['y'],
+                        linewidth=2,
+                        color=colors[dt],
+                        label=f'dt={dt}')
+
+            self.tree.item(rows[dt], values=(
+                f"{dt}",
+                f"{result['range']:.2f}",
+                f"{result['max_height']:.2f}",
+                f"{result['final_velocity']:.2f}"
+            ))
 
-                self.tree.insert('', tk.END, values=(
-                    f"{dt}",
-                    f"{result['range']:.2f}",
-                    f"{result['max_height']:.2f}",
-                    f"{result['final_velocity']:.2f}"
-                ))
+            self.ax.legend(loc='upper right')
+            self.canvas.draw_idle()
 
-            self.ax.legend([f'dt={dt}' for dt in steps], loc='upper right')
-            self.canvas.draw()
+        def show_order(estimates):
+            # Наблюдаемый порядок и экстраполяция Ричардсона по трём мелким шагам
+            if run_id != self.study.run_id or not estimates:
+                return
+            dt, p, extrapolated = estimates[-1]
+            self.tree.insert('', tk.END, values=(
+                f"Ричардсон, p≈{p:.2f}",
+                f"{extrapolated:.2f}",
+                "—",
+                "—"
+            ))
 
-        except ValueError:
-            messagebox.showerror("Ошибка")
+        run_id = self.study.run(v0, angle, steps, m, S,
+                                on_result=lambda dt, result, error: self.root.after(0, show_result, dt, result, error),
+                                on_done=lambda results, estimates: self.root.after(0, show_order, estimates))
+
+        # Адаптивный метод для сравнения: дальность с точностью rtol
+        result = self.simulator.simulate_adaptive(v0, angle, m, S)
+        self.results.append(result)
+        self.ax.plot(result['x'], result['y'], 'k--', linewidth=1.5, label=f"DP5, rtol={result['rtol']:g}")
+        self.tree.insert('', tk.END, values=(
+            f"DP5 ({result['nfev']} выч.)",
+            f"{result['range']:.2f}",
+            f"{result['max_height']:.2f}",
+            f"{result['final_velocity']:.2f}"
+        ))
+
+        self.ax.legend(loc='upper right')
+        self.canvas.draw()
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = SimulationApp(root)
 
     root.mainloop()
+    app.study.close()
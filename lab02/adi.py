@@ -0,0 +1,147 @@
+import time
+
+import numpy as np
+from numba import jit, prange
+
+from solver import factorize, solve_factored
+
+# Пластина (2D) и брус (3D) методом переменных направлений в варианте
+# локально-одномерной схемы: шаг tau = неявная прогонка вдоль каждой оси по очереди.
+# Каждая прогонка — та же, что у стержня (factorize / solve_factored), линии
+# вдоль оси независимы и считаются параллельно. Работа за шаг — O(число узлов).
+# Края поля не меняются: граничные условия первого рода берутся из начального поля.
+#
+#   python adi.py --size 1000 1000 --steps 20
+
+BLOCK = 64  # столбцов за раз при прогонке поперёк строк памяти
+
+
+@jit(nopython=True, parallel=True, cache=True)
+def sweep_lines(T, a0, a1, b0, b1, k, alpha, inv_den, C_i):
+    # Прогонка вдоль последней оси: T[a, b, :] — непрерывная линия.
+    # Только внутренние линии a0 <= a < a1, b0 <= b < b1: линии на гранях —
+    # граничные значения, их прогонка размазала бы грань вдоль себя самой
+    B = b1 - b0
+    n = T.shape[2]
+    for task in prange((a1 - a0) * B):
+        line = T[a0 + task // B, b0 + task % B]
+        beta = np.empty(n)
+        solve_factored(line, k, alpha, inv_den, C_i, line[0], line[n - 1], beta, line)
+
+
+@jit(nopython=True, parallel=True, cache=True)
+def sweep_strided(T, p0, p1, r0, r1, s0, s1, k, alpha, inv_den, C_i):
+    # Прогонка вдоль оси 1 у T[p, :, r, s] для внутренних p, r, s. Та же формула,
+    # что в solve_factored, но сразу для BLOCK соседних s: внутренний цикл идёт по памяти подряд
+    n = T.shape[1]
+    R = r1 - r0
+    blocks = (s1 - s0 + BLOCK - 1) // BLOCK
+    for task in prange((p1 - p0) * R * blocks):
+        p = p0 + task // (R * blocks)
+        r = r0 + task // blocks % R
+        q0 = s0 + (task % blocks) * BLOCK
+        q1 = min(q0 + BLOCK, s1)
+        beta = np.empty((n, q1 - q0))
+        for q in range(q0, q1):
+            beta[0, q - q0] = T[p, 0, r, q]
+        for i in range(1, n - 1):
+            for q in range(q0, q1):
+                beta[i, q - q0] = (C_i * beta[i - 1, q - q0] + k * T[p, i, r, q]) * inv_den[i]
+        for i in range(n - 2, 0, -1):
+            for q in range(q0, q1):
+                T[p, i, r, q] = alpha[i] * T[p, i + 1, r, q] + beta[i, q - q0]
+
+
+def interior(sizes):
+    # Диапазон внутренних индексов по каждой оси; пустые оси (размер 1) целиком
+    return [(1, size - 1) if real else (0, 1) for size, real in sizes]
+
+
+class ADIOperator:
+    # cells — число отрезков по каждой оси, lengths — размеры области, м
+    def __init__(self, cells, lengths, rho, c, lam, tau):
+        self.cells = tuple(int(n) for n in cells)
+        self.shape = tuple(n + 1 for n in self.cells)
+        self.k = rho * c / tau
+        self.axes = []
+        for n, L in zip(self.cells, lengths):
+            h = L / n
+            A_i = lam / h**2
+            B_i = 2 * lam / h**2 + self.k
+            alpha, inv_den = factorize(n, A_i, B_i, A_i)
+            self.axes.append((alpha, inv_den, A_i))
+
+    def step(self, T):
+        # Один шаг tau на месте, T должен быть C-непрерывным массивом формы self.shape.
+        # Оси дополняются до 3 (линии) или 4 (поперёк памяти) фиктивными осями размера 1
+        shape = T.shape
+        for axis, (alpha, inv_den, C_i) in enumerate(self.axes):
+            n = shape[axis]
+            if axis == T.ndim - 1:
+                outer = [(size, True) for size in shape[:axis]]
+                outer = [(1, False)] * (2 - len(outer)) + outer
+                (a0, a1), (b0, b1) = interior(outer)
+                view = T.reshape(outer[0][0], outer[1][0], n)
+                sweep_lines(view, a0, a1, b0, b1, self.k, alpha, inv_den, C_i)
+            else:
+                before = [(size, True) for size in shape[:axis]]
+                after = [(size, True) for size in shape[axis + 1:]]
+                before = [(1, False)] * (1 - len(before)) + before
+                after = [(1, False)] * (2 - len(after)) + after
+                (p0, p1), (r0, r1), (s0, s1) = interior(before + after)
+                view = T.reshape(before[0][0], n, after[0][0], after[1][0])
+                sweep_strided(view, p0, p1, r0, r1, s0, s1, self.k, alpha, inv_den, C_i)
+        return T
+
+
+def initial_field(cells, T0, T_edge):
+    # Внутри T0, на всех гранях T_edge; отдельные грани можно переписать после
+    T = np.full(tuple(n + 1 for n in cells), float(T0))
+    for axis in range(T.ndim):
+        edge = [slice(None)] * T.ndim
+        for i in (0, -1):
+            edge[axis] = i
+            T[tuple(edge)] = T_edge
+    return T
+
+
+def simulate_adi(rho, c, lam, T0, T_edge, lengths, h, total_time, tau):
+    # Аналог solver.simulate для пластины (2 длины) или бруса (3 длины)
+    cells = [max(int(round(L / h)), 2) for L in lengths]
+    steps_n = max(int(round(total_time / tau)), 1)
+
+    operator = ADIOperator(cells, lengths, rho, c, lam, tau)
+    T = initial_field(cells, T0, T_edge)
+    for n in range(steps_n):
+        operator.step(T)
+
+    return T, T[tuple(n // 2 for n in cells)]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Время шага ADI для пластины/бруса")
+    parser.add_argument("--size", type=int, nargs="+", default=[1000, 1000], help="отрезков по осям")
+    parser.add_argument("--steps", type=int, default=20)
+    parser.add_argument("--tau", type=float, default=0.01)
+    args = parser.parse_args()
+
+    # Медь, область 0.1 м по каждой оси
+    rho, c, lam = 8960, 385, 401
+    lengths = [0.1] * len(args.size)
+    operator = ADIOperator(args.size, lengths, rho, c, lam, args.tau)
+    T = initial_field(args.size, 20.0, 300.0)
+
+    operator.step(T)  # компиляция
+    start = time.perf_counter()
+    for n in range(args.steps):
+        operator.step(T)
+    per_step = (time.perf_counter() - start) / args.steps
+
+    print(f"Сетка {' x '.join(str(n + 1) for n in args.size)}: {per_step * 1000:.1f} мс на шаг, "
+          f"{T.size / per_step / 1e6:.0f} млн узлов/с, центр {T[tuple(n // 2 for n in args.size)]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
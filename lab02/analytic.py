@@ -0,0 +1,58 @@
+import math
+
+import numpy as np
+
+# Точное решение для стержня с постоянными коэффициентами, T(0) = Ta, T(L) = Tn
+# и однородной начальной температурой T0:
+#   T(x, t) = Ta + (Tn - Ta) x / L + sum b_n sin(n pi x / L) exp(-a (n pi / L)^2 t),
+#   b_n = 2 / (n pi) * [(T0 - Ta)(1 - (-1)^n) + (Tn - Ta)(-1)^n],  a = lam / (rho c).
+# Число членов подбирается так, чтобы отброшенный хвост был меньше tol.
+
+
+def coefficients(Ta, Tn, T0, n):
+    sign = np.where(n % 2 == 0, 1.0, -1.0)
+    return 2 / (n * np.pi) * ((T0 - Ta) * (1 - sign) + (Tn - Ta) * sign)
+
+
+def terms_needed(decay, bound, tol, max_terms=1_000_000):
+    # |b_n| <= bound / n, поэтому хвост после N членов не больше
+    #   bound / (N + 1) * sum_{n > N} exp(-decay n^2)
+    #   <= bound / (N + 1) * sqrt(pi / decay) / 2 * erfc(N sqrt(decay))
+    root = math.sqrt(decay)
+    n = 1
+    while n < max_terms:
+        tail = bound / (n + 1) * math.sqrt(math.pi) / (2 * root) * math.erfc(n * root)
+        if tail < tol:
+            return n
+        n = n + 1 if n < 64 else n * 2
+    return max_terms
+
+
+def exact_profile(rho, c, lam, Ta, Tn, T0, L, x, t, tol=1e-10):
+    x = np.asarray(x, dtype=np.float64)
+    if t <= 0:
+        # При t = 0 ряд не сходится равномерно (скачок на краях) — отдаём начальное поле
+        T = np.full(x.shape, float(T0))
+        T[x <= 0] = Ta
+        T[x >= L] = Tn
+        return T
+
+    decay = lam / (rho * c) * (np.pi / L) ** 2 * t
+    bound = 2 / np.pi * (2 * abs(T0 - Ta) + abs(Tn - Ta))
+    N = terms_needed(decay, bound, tol)
+
+    T = Ta + (Tn - Ta) * x / L
+    # Блоками по членам ряда, чтобы матрица sin не разрасталась при малых t
+    for start in range(1, N + 1, 4096):
+        n = np.arange(start, min(start + 4096, N + 1))
+        b = coefficients(Ta, Tn, T0, n) * np.exp(-decay * n.astype(np.float64) ** 2)
+        T += np.sin(np.outer(x, n) * (np.pi / L)) @ b
+    return T
+
+
+def exact_simulate(rho, c, lam, Ta, Tn, T0, L, h, total_time, tol=1e-10):
+    # Точное поле в узлах той же сетки, что у solver.simulate
+    Nx = max(int(round(L / h)), 2)
+    x = np.arange(Nx + 1) * (L / Nx)
+    T = exact_profile(rho, c, lam, Ta, Tn, T0, L, x, total_time, tol)
+    return T, T[Nx // 2]
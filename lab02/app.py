@@ -5,7 +5,9 @@ import time
 import threading
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
-from solver import simulate, calculate_next_step
+from solver import heat_operator, warmup
+from analytic import exact_simulate
+from table_engine import TableEngine
 
 class Colors:
     BG_MAIN = "#f8f9fa"
@@ -56,13 +58,30 @@ class HeatApp:
             "Сталь": {"Плотность": 7850, "Теплоёмкость": 475, "Теплопроводность": 50, "Длина": 0.1},
         }
         self.current_material = "Медь"
+
+        # Схемы по времени из solver.SCHEMES для заполнения таблицы
+        self.schemes = {
+            "Неявная": "implicit",
+            "Кранк–Николсон": "crank-nicolson",
+            "BDF2": "bdf2",
+            "Ричардсон": "richardson",
+        }
         
         self.running = False
         self.animation_job = None
+        self.table_engine = TableEngine()
 
         self.setup_styles()
         self.create_layout()
 
+        # Ядра numba компилируются (или читаются из кэша) пока пользователь вводит параметры
+        self.table_status.config(text="Подготовка решателя…")
+        threading.Thread(target=self.warmup_solver, daemon=True).start()
+
+    def warmup_solver(self):
+        seconds = warmup()
+        self.root.after(0, self.table_status.config, {"text": f"Решатель готов за {seconds:.1f} с"})
+
     def setup_styles(self):
         style = ttk.Style()
         style.theme_use("clam")
@@ -160,8 +179,19 @@ class HeatApp:
         ], ["180", "300", "30"])
 
         self.create_block(panel, "Расчёт", [
-            "Шаг пространства", "Шаг времени", "Время моделирования"
-        ], ["0.01", "0.01", "2"])
+            "Шаг пространства", "Шаг времени", "Время моделирования", "Шагов за кадр"
+        ], ["0.01", "0.01", "2", "1"])
+
+        scheme_frame = ttk.Frame(panel)
+        scheme_frame.pack(fill=tk.X, pady=(0, 12))
+
+        ttk.Label(scheme_frame, text="Схема таблицы:", 
+                 font=Fonts.LABEL_SMALL).pack(side=tk.LEFT)
+
+        self.scheme_combo = ttk.Combobox(scheme_frame, values=list(self.schemes.keys()),
+                                         font=Fonts.VALUE, width=14, state="readonly")
+        self.scheme_combo.set("Неявная")
+        self.scheme_combo.pack(side=tk.RIGHT, padx=(12, 0))
 
         btn_frame = ttk.Frame(panel)
         btn_frame.pack(fill=tk.X, pady=20)
@@ -173,8 +203,10 @@ class HeatApp:
                   command=self.stop_animation).pack(fill=tk.X, pady=(0, 8))
 
         self.btn_calc = ttk.Button(btn_frame, text="Заполнить таблицу", 
-                                  command=self.start_table_thread)
-        self.btn_calc.pack(fill=tk.X)
+                                  command=self.start_table)
+        self.btn_calc.pack(fill=tk.X, pady=(0, 8))
+        ttk.Button(btn_frame, text="Отменить расчёт таблицы", 
+                  command=self.cancel_table).pack(fill=tk.X)
 
         status_frame = ttk.Frame(panel)
         status_frame.pack(fill=tk.X, pady=(20, 0))
@@ -189,7 +221,17 @@ class HeatApp:
                 font=("Segoe UI", 11)).pack(anchor="w")
         self.temp_value = tk.Label(status_frame, text="— °C", 
                                 font=("Segoe UI", 16, "bold"))
-        self.temp_value.pack(anchor="w")
+        self.temp_value.pack(anchor="w", pady=(5, 15))
+
+        ttk.Label(status_frame, text="Скорость модели:", 
+                font=("Segoe UI", 11)).pack(anchor="w")
+        self.rate_value = tk.Label(status_frame, text="— с/с", 
+                                font=("Segoe UI", 16, "bold"))
+        self.rate_value.pack(anchor="w")
+
+        self.table_status = tk.Label(status_frame, text="", font=("Segoe UI", 10),
+                                     wraplength=220, justify="left")
+        self.table_status.pack(anchor="w", pady=(15, 0))
 
     def on_material_change(self, event=None):
         selected = self.material_combo.get()
@@ -238,8 +280,33 @@ class HeatApp:
             ax.grid(True, color=Colors.GRID_LINE, linewidth=0.5, alpha=0.7)
             ax.tick_params(colors=Colors.TEXT_SECONDARY, labelsize=9)
 
+        # Оформление рисуется один раз; профиль и полоса помечены animated
+        # и перерисовываются поверх сохранённого фона (блиттинг)
+        self.ax1.set_xlabel("Длина, м", color=Colors.TEXT_SECONDARY)
+        self.ax1.set_ylabel("°C", color=Colors.TEXT_SECONDARY, rotation=0)
+        self.ax1.set_title("Профиль температуры", color=Colors.TEXT_PRIMARY, fontweight="bold", pad=10)
+        self.line, = self.ax1.plot([], [], color=Colors.PLOT_LINE, lw=2.5, animated=True)
+
+        self.ax2.set_yticks([])
+        self.ax2.set_xlabel("Длина, м", color=Colors.TEXT_SECONDARY)
+        self.ax2.set_title("Визуализация тепла", color=Colors.TEXT_PRIMARY, fontweight="bold", pad=10)
+        self.image = self.ax2.imshow([[0.0, 0.0]], aspect='auto', cmap='coolwarm',
+                                     interpolation='bilinear', animated=True)
+        self.ax2.grid(False)
+
         self.canvas = FigureCanvasTkAgg(self.fig, master=viz_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.background = None
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+
+    def on_draw(self, event):
+        # Полная перерисовка (старт, изменение размера окна) — новый фон
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_artists()
+
+    def draw_artists(self):
+        self.ax1.draw_artist(self.line)
+        self.ax2.draw_artist(self.image)
 
     def create_tables(self, parent):
         tables_frame = ttk.LabelFrame(parent, text="Температура в центре (t=2с)", padding=15)
@@ -282,6 +349,7 @@ class HeatApp:
         self.h = p["Шаг пространства"]
         self.dt = p["Шаг времени"]
         self.t_end = p["Время моделирования"]
+        self.steps_per_frame = max(int(p["Шагов за кадр"]), 1)
 
     def start_animation(self):
         if self.running:
@@ -297,52 +365,47 @@ class HeatApp:
         self.T = np.full(self.Nx + 1, self.T0)
         self.T[0], self.T[-1] = self.Tl, self.Tr
 
-        dx = self.L / self.Nx
-        self.A = self.lam / dx**2
-        self.C = self.A
-        self.B = 2 * self.lam / dx**2 + self.rho * self.c / self.dt
-
-        self.alpha = np.zeros(self.Nx + 1)
-        self.beta = np.zeros(self.Nx + 1)
+        # Прогонка одна на все шаги и переживает перезапуски анимации
+        self.operator = heat_operator(self.Nx, self.L, self.rho, self.c, self.lam, self.dt)
         self.current_time = 0
 
+        # По принципу максимума температура не выходит за пределы начальной
+        # и граничных, поэтому оси и шкала цвета фиксируются на весь запуск
+        low = min(self.T0, self.Tl, self.Tr)
+        high = max(self.T0, self.Tl, self.Tr)
+        pad = max((high - low) * 0.05, 1.0)
+        self.ax1.set_xlim(0, self.L)
+        self.ax1.set_ylim(low - pad, high + pad)
+        self.line.set_data(self.x, self.T)
+        self.ax2.set_xlim(0, self.L)
+        self.image.set_extent([0, self.L, 0, 0.1])
+        self.image.set_data(self.T[np.newaxis])
+        self.image.set_clim(low, high)
+        self.canvas.draw()
+
+        self.wall_start = time.perf_counter()
         self.update_animation()
 
     def update_animation(self):
         if not self.running:
             return
 
-        self.T = calculate_next_step(
-            self.T, self.alpha, self.beta,
-            self.A, self.B, self.C,
-            self.Nx, self.rho, self.c,
-            self.dt, self.Tl, self.Tr
-        )
-        self.current_time += self.dt
-
-        self.ax1.clear()
-        self.ax1.set_facecolor(Colors.BG_CARD)
-        self.ax1.plot(self.x, self.T, color=Colors.PLOT_LINE, lw=2.5)
-        self.ax1.set_xlabel("Длина, м", color=Colors.TEXT_SECONDARY)
-        self.ax1.set_ylabel("°C", color=Colors.TEXT_SECONDARY, rotation=0)
-        self.ax1.set_title("Профиль температуры", color=Colors.TEXT_PRIMARY, fontweight="bold", pad=10)
-        self.ax1.grid(True, color=Colors.GRID_LINE, alpha=0.7, linewidth=0.5)
-        self.ax1.tick_params(colors=Colors.TEXT_SECONDARY)
-
-        self.ax2.clear()
-        self.ax2.set_facecolor(Colors.BG_CARD)
-        self.ax2.imshow([self.T], aspect='auto', cmap='coolwarm',
-                       extent=[0, self.L, 0, 0.1], interpolation='bilinear')
-        self.ax2.set_yticks([])
-        self.ax2.set_xlabel("Длина, м", color=Colors.TEXT_SECONDARY)
-        self.ax2.set_title("Визуализация тепла", color=Colors.TEXT_PRIMARY, fontweight="bold", pad=10)
-        self.ax2.tick_params(colors=Colors.TEXT_SECONDARY)
+        self.operator.advance(self.T, self.Tl, self.Tr, self.steps_per_frame)
+        self.current_time += self.dt * self.steps_per_frame
 
-        self.canvas.draw_idle()
+        self.line.set_ydata(self.T)
+        self.image.set_data(self.T[np.newaxis])
+        if self.background is not None:
+            self.canvas.restore_region(self.background)
+            self.draw_artists()
+            self.canvas.blit(self.fig.bbox)
 
         center = self.T[self.Nx // 2]
         self.time_value.config(text=f"{self.current_time:.2f} с")
         self.temp_value.config(text=f"{center:.2f} °C")
+        wall = time.perf_counter() - self.wall_start
+        if wall > 0:
+            self.rate_value.config(text=f"{self.current_time / wall:.3g} с/с")
 
         self.animation_job = self.root.after(40, self.update_animation)
 
@@ -352,33 +415,71 @@ class HeatApp:
             self.root.after_cancel(self.animation_job)
             self.animation_job = None
 
-    def start_table_thread(self):
+    def start_table(self):
         if self.running:
             return
-        self.btn_calc.config(state="disabled")
-        threading.Thread(target=self.calculate_table, daemon=True).start()
+        try:
+            self.read_params()
+        except ValueError as e:
+            self.table_status.config(text=f"Ошибка параметров: {e}")
+            return
 
-    def calculate_table(self):
-        self.root.after(0, lambda: self.temp_table.delete(*self.temp_table.get_children()))
-        
-        self.read_params()
+        params = {"rho": self.rho, "c": self.c, "lam": self.lam,
+                  "Ta": self.Tl, "Tn": self.Tr, "T0": self.T0, "L": self.L}
         dts = [0.1, 0.01, 0.001, 0.0001]
         hs = [0.1, 0.01, 0.001, 0.0001]
 
-        for dt_val in dts:
-            temp_row = [f"{dt_val:g}"]
-            for h_val in hs:
-                try:
-                    _, center = simulate(self.rho, self.c, self.lam, self.Tl, self.Tr, self.T0,
-                                       self.L, h_val, 2.0, dt_val)
-                    temp_row.append(f"{center:.2f}")
-                except:
-                    temp_row.append("—")
-            self.root.after(0, lambda row=temp_row: self.temp_table.insert("", tk.END, values=row))
-        
-        self.root.after(0, lambda: self.btn_calc.config(state="normal"))
+        # Строки создаются сразу, ячейки заполняются по мере готовности
+        self.temp_table.delete(*self.temp_table.get_children())
+        self.table_rows = {dt: self.temp_table.insert("", tk.END, values=[f"{dt:g}"] + ["…"] * len(hs))
+                           for dt in dts}
+
+        # Точный ответ из ряда Фурье в том же узле, что и у численной схемы
+        exact = [exact_simulate(self.rho, self.c, self.lam, self.Tl, self.Tr, self.T0, self.L, h, 2.0)[1]
+                 for h in hs]
+        self.temp_table.insert("", tk.END, values=["точно"] + [f"{value:.2f}" for value in exact])
+        self.table_errors = []
+
+        self.btn_calc.config(state="disabled")
+        self.table_status.config(text=f"Таблица: 0/{len(dts) * len(hs)}")
+
+        def in_gui(callback):
+            # Колбэк из потока пула уходит в очередь Tk, run_id сверяется уже там:
+            # вызовы, поставленные до отмены или нового запуска, не выполняются
+            def run_if_current(*args):
+                if run_id == self.table_engine.run_id:
+                    callback(*args)
+            return lambda *args: self.root.after(0, run_if_current, *args)
+
+        run_id = self.table_engine.start(
+            params, dts, hs, 2.0,
+            on_cell=in_gui(self.show_table_cell),
+            on_progress=in_gui(self.show_table_progress),
+            on_done=in_gui(lambda: self.btn_calc.config(state="normal")),
+            scheme=self.schemes[self.scheme_combo.get()]
+        )
+
+    def show_table_cell(self, dt, h, center, error):
+        if error is None:
+            value = f"{center:.2f}"
+        else:
+            value = "ошибка"
+            self.table_errors.append(f"dt={dt:g}, h={h:g}: {error}")
+        self.temp_table.set(self.table_rows[dt], f"{h:g}", value)
+
+    def show_table_progress(self, done, total):
+        text = f"Таблица: {done}/{total}"
+        if self.table_errors:
+            text += "\n" + self.table_errors[-1]
+        self.table_status.config(text=text)
+
+    def cancel_table(self):
+        self.table_engine.cancel()
+        self.table_status.config(text="Таблица: расчёт отменён")
+        self.btn_calc.config(state="normal")
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = HeatApp(root)
     root.mainloop()
+    app.table_engine.cancel()
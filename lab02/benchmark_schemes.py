@@ -0,0 +1,48 @@
+import argparse
+import time
+
+import numpy as np
+
+from solver import SCHEMES, simulate_cn, warmup
+
+# Точность схем по времени против затраченного времени:
+#   python benchmark_schemes.py --h 0.001 --time 2
+#
+# Эталон — Кранк–Николсон с очень мелким шагом на той же сетке, поэтому
+# в ошибку входит только погрешность по времени.
+
+
+def measure(scheme, args, tau, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        T, center = scheme(*args, tau)
+        best = min(best, time.perf_counter() - start)
+    return T, center, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ошибка и время схем для уравнения теплопроводности")
+    parser.add_argument("--h", type=float, default=0.001, help="шаг по пространству, м")
+    parser.add_argument("--time", type=float, default=2.0, help="время моделирования, с")
+    parser.add_argument("--taus", type=float, nargs="+", default=[0.2, 0.1, 0.05, 0.02, 0.01, 0.005, 0.001])
+    parser.add_argument("--ref-tau", type=float, default=1e-5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Медь, как в HeatApp по умолчанию
+    params = (8960.0, 385.0, 401.0, 300.0, 30.0, 180.0, 0.1, args.h, args.time)
+    warmup()
+    ref, ref_center = simulate_cn(*params, args.ref_tau)
+
+    print(f"{'схема':>15} {'tau':>8} {'время, мс':>10} {'макс. ошибка':>13} {'ошибка в центре':>16}")
+    for name, scheme in SCHEMES.items():
+        for tau in args.taus:
+            T, center, seconds = measure(scheme, params, tau, args.repeat)
+            print(f"{name:>15} {tau:>8g} {seconds * 1000:>10.3f} "
+                  f"{np.abs(T - ref).max():>13.2e} {abs(center - ref_center):>16.2e}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,75 @@
+import time
+from functools import lru_cache
+
 import numpy as np
-from numba import jit
+from numba import jit, prange
+
+
+# ПРЕДРАСЧЁТ ПРОГОНКИ
+# При постоянных коэффициентах alpha и знаменатели одинаковы на всех шагах,
+# на каждом шаге остаётся только ход по правой части (beta) и обратный ход.
+@jit(nopython=True, cache=True)
+def factorize(Nx, A_i, B_i, C_i):
+    alpha = np.zeros(Nx + 1)
+    inv_den = np.zeros(Nx + 1)
+    for i in range(1, Nx):
+        den = B_i - C_i * alpha[i - 1]
+        alpha[i] = A_i / den
+        inv_den[i] = 1.0 / den
+    return alpha, inv_den
+
+
+@jit(nopython=True, cache=True)
+def solve_factored(rhs, scale, alpha, inv_den, C_i, left, right, beta, out):
+    # Правая часть scale * rhs[i] (для неявной схемы rhs = T, scale = rho*c/tau).
+    # out может совпадать с rhs: rhs[i] читается раньше, чем out[i] перезаписывается.
+    Nx = len(rhs) - 1
+    beta[0] = left
+    for i in range(1, Nx):
+        beta[i] = (C_i * beta[i - 1] + scale * rhs[i]) * inv_den[i]
+
+    out[0] = left
+    out[Nx] = right
+    for i in range(Nx - 1, 0, -1):
+        out[i] = alpha[i] * out[i + 1] + beta[i]
+    return out
+
+
+class HeatOperator:
+    # Один шаг неявной схемы для стержня из Nx отрезков длины L
+    def __init__(self, Nx, L, rho, c, lam, tau):
+        h = L / Nx
+        self.Nx = Nx
+        self.A = lam / h**2
+        self.C = self.A
+        self.B = 2 * lam / h**2 + rho * c / tau
+        self.k = rho * c / tau
+        self.alpha, self.inv_den = factorize(Nx, self.A, self.B, self.C)
 
-@jit(nopython=True)
+    def step(self, T, Ta, Tn, out=None):
+        if out is None:
+            out = np.empty_like(T)
+        beta = np.empty(self.Nx + 1)
+        return solve_factored(T, self.k, self.alpha, self.inv_den, self.C, float(Ta), float(Tn), beta, out)
+
+    def advance(self, T, Ta, Tn, steps):
+        # steps шагов на месте без возврата в Python между шагами
+        return run_steps(T, self.k, self.alpha, self.inv_den, self.C, float(Ta), float(Tn), steps)
+
+
+@jit(nopython=True, cache=True)
+def run_steps(T, k, alpha, inv_den, C_i, left, right, steps):
+    beta = np.empty(len(T))
+    for n in range(steps):
+        solve_factored(T, k, alpha, inv_den, C_i, left, right, beta, T)
+    return T
+
+
+@lru_cache(maxsize=32)
+def heat_operator(Nx, L, rho, c, lam, tau):
+    return HeatOperator(Nx, L, rho, c, lam, tau)
+
+@jit(nopython=True, cache=True)
 def simulate(rho, c, lam, Ta, Tn, T0, L, h, total_time, tau):
     Nx = int(round(L / h))
     if Nx < 2: Nx = 2
@@ -19,34 +87,205 @@ def simulate(rho, c, lam, Ta, Tn, T0, L, h, total_time, tau):
     C_i = A_i
     B_i = (2 * lam / h**2) + (rho * c / tau)
 
-    alpha = np.zeros(Nx + 1)
-    beta = np.zeros(Nx + 1)
+    alpha, inv_den = factorize(Nx, A_i, B_i, C_i)
+    beta = np.empty(Nx + 1)
 
     for n in range(steps_n):
-        alpha[0] = 0.0
-        beta[0] = float(Ta)
+        solve_factored(T, rho * c / tau, alpha, inv_den, C_i, float(Ta), float(Tn), beta, T)
+
+    return T, T[Nx // 2]
+
+
+# УСТАНОВИВШИЙСЯ РЕЖИМ
+@jit(nopython=True, cache=True)
+def simulate_steady(rho, c, lam, Ta, Tn, T0, L, h, total_time, tau, tol):
+    # Как simulate, но расчёт останавливается, как только температура за шаг
+    # меняется меньше чем на tol во всех узлах. Возвращает также число шагов
+    # и модельное время остановки (если не сошлось — total_time).
+    Nx = max(int(round(L / h)), 2)
+    h = L / Nx
+    steps_n = max(int(round(total_time / tau)), 1)
+
+    T = np.full(Nx + 1, float(T0))
+    T[0] = float(Ta)
+    T[Nx] = float(Tn)
+    T_next = np.empty(Nx + 1)
+
+    A_i = lam / h**2
+    k = rho * c / tau
+    alpha, inv_den = factorize(Nx, A_i, 2 * A_i + k, A_i)
+    beta = np.empty(Nx + 1)
+
+    steps = 0
+    while steps < steps_n:
+        solve_factored(T, k, alpha, inv_den, A_i, float(Ta), float(Tn), beta, T_next)
+        steps += 1
+        change = 0.0
+        for i in range(1, Nx):
+            change = max(change, abs(T_next[i] - T[i]))
+        T, T_next = T_next, T
+        if change < tol:
+            break
+
+    return T, T[Nx // 2], steps, steps * tau
+
+
+@jit(nopython=True, cache=True)
+def steady_state(Ta, Tn, L, h, lam=1.0):
+    # Равновесный профиль сразу: та же прогонка без члена rho*c/tau и без
+    # правой части. При постоянной lam ответ — прямая от Ta до Tn, lam на него не влияет
+    Nx = max(int(round(L / h)), 2)
+    h = L / Nx
+    A_i = lam / h**2
+    alpha, inv_den = factorize(Nx, A_i, 2 * A_i, A_i)
+
+    T = np.zeros(Nx + 1)
+    solve_factored(T, 0.0, alpha, inv_den, A_i, float(Ta), float(Tn), np.empty(Nx + 1), T)
+    return T, T[Nx // 2]
+
+
+# СХЕМЫ ВТОРОГО ПОРЯДКА ПО ВРЕМЕНИ
+# Та же прогонка, меняются только коэффициенты и правая часть.
+@jit(nopython=True, cache=True)
+def simulate_cn(rho, c, lam, Ta, Tn, T0, L, h, total_time, tau):
+    # Кранк–Николсон: полусумма неявного и явного оператора
+    Nx = max(int(round(L / h)), 2)
+    h = L / Nx
+    steps_n = max(int(round(total_time / tau)), 1)
+
+    T = np.full(Nx + 1, float(T0))
+    T[0] = float(Ta)
+    T[Nx] = float(Tn)
+    rhs = T.copy()
+    beta = np.empty(Nx + 1)
+
+    # Старт по Раннахеру: первые два шага — по два полушага неявной схемы,
+    # иначе скачок между T0 и граничными температурами даёт колебания
+    k_half = 2 * rho * c / tau
+    A_e = lam / h**2
+    alpha_e, inv_den_e = factorize(Nx, A_e, 2 * A_e + k_half, A_e)
+    start = min(2, steps_n)
+    for n in range(2 * start):
+        solve_factored(T, k_half, alpha_e, inv_den_e, A_e, float(Ta), float(Tn), beta, T)
 
+    k = rho * c / tau
+    A_i = lam / (2 * h**2)
+    alpha, inv_den = factorize(Nx, A_i, 2 * A_i + k, A_i)
+    r = tau * lam / (2 * rho * c * h**2)
+    for n in range(start, steps_n):
         for i in range(1, Nx):
-            F_i = -(rho * c / tau) * T[i]
+            rhs[i] = T[i] + r * (T[i - 1] - 2 * T[i] + T[i + 1])
+        solve_factored(rhs, k, alpha, inv_den, A_i, float(Ta), float(Tn), beta, T)
+
+    return T, T[Nx // 2]
+
 
+@jit(nopython=True, cache=True)
+def simulate_bdf2(rho, c, lam, Ta, Tn, T0, L, h, total_time, tau):
+    # BDF2: (3T[n+1] - 4T[n] + T[n-1]) / (2 tau), первый шаг — неявной схемой
+    Nx = max(int(round(L / h)), 2)
+    h = L / Nx
+    steps_n = max(int(round(total_time / tau)), 1)
 
-            alpha[i] = A_i / (B_i - C_i * alpha[i - 1])
-            beta[i] = (C_i * beta[i - 1] - F_i) / (B_i - C_i * alpha[i - 1])
+    T = np.full(Nx + 1, float(T0))
+    T[0] = float(Ta)
+    T[Nx] = float(Tn)
+    T_prev = T.copy()
+    rhs = T.copy()
+    beta = np.empty(Nx + 1)
 
-        T_next = np.empty(Nx + 1)
-        T_next[Nx] = float(Tn)
-        T_next[0] = float(Ta)
+    k = rho * c / tau
+    A_i = lam / h**2
+    alpha, inv_den = factorize(Nx, A_i, 2 * A_i + k, A_i)
+    solve_factored(T, k, alpha, inv_den, A_i, float(Ta), float(Tn), beta, T)
 
-        for i in range(Nx - 1, 0, -1):
-            T_next[i] = alpha[i] * T_next[i + 1] + beta[i]
-        
-        T = T_next
+    alpha, inv_den = factorize(Nx, A_i, 2 * A_i + 1.5 * k, A_i)
+    for n in range(1, steps_n):
+        for i in range(1, Nx):
+            rhs[i] = 2 * T[i] - 0.5 * T_prev[i]
+        T_prev[:] = T
+        solve_factored(rhs, k, alpha, inv_den, A_i, float(Ta), float(Tn), beta, T)
 
     return T, T[Nx // 2]
 
 
+def simulate_richardson(rho, c, lam, Ta, Tn, T0, L, h, total_time, tau):
+    # Экстраполяция Ричардсона неявной схемы: 2 T(tau/2) - T(tau).
+    # Оба прохода идут до одного момента steps_n * tau (steps_n и 2 * steps_n
+    # шагов), иначе при нецелом total_time / tau их времена не совпадут
+    steps_n = max(int(round(total_time / tau)), 1)
+    end_time = steps_n * tau
+    T_coarse, _ = simulate(rho, c, lam, Ta, Tn, T0, L, h, end_time, tau)
+    T_fine, _ = simulate(rho, c, lam, Ta, Tn, T0, L, h, end_time, tau / 2)
+    T = 2 * T_fine - T_coarse
+    return T, T[(len(T) - 1) // 2]
+
+
+SCHEMES = {
+    "implicit": simulate,
+    "crank-nicolson": simulate_cn,
+    "bdf2": simulate_bdf2,
+    "richardson": simulate_richardson,
+}
+
+
+# ИСТОРИЯ ТЕМПЕРАТУРЫ
+def history_steps(steps_n, every):
+    # Номера шагов со снимками: 0, every, 2*every, ... и всегда последний
+    marks = list(range(0, steps_n + 1, every))
+    if marks[-1] != steps_n:
+        marks.append(steps_n)
+    return marks
+
+
+def iter_history(rho, c, lam, Ta, Tn, T0, L, h, total_time, tau, every=1, decimate=1):
+    # Генератор снимков (t, T[::decimate]) каждые every шагов. В памяти только
+    # текущее поле: снимок — копия, её можно сохранить или выбросить
+    Nx = max(int(round(L / h)), 2)
+    steps_n = max(int(round(total_time / tau)), 1)
+
+    operator = heat_operator(Nx, L, rho, c, lam, tau)
+    T = np.full(Nx + 1, float(T0))
+    T[0] = float(Ta)
+    T[Nx] = float(Tn)
+
+    done = 0
+    for mark in history_steps(steps_n, every):
+        operator.advance(T, Ta, Tn, mark - done)
+        done = mark
+        yield mark * tau, T[::decimate].copy()
+
+
+def simulate_history(rho, c, lam, Ta, Tn, T0, L, h, total_time, tau, every=1, decimate=1,
+                     out=None, path=None):
+    # Всё поле пространство–время: строка history[j] — снимок в момент times[j].
+    # out — готовый массив нужной формы, path — файл .npy, который открывается
+    # через memmap (np.load(path, mmap_mode="r") читает его обратно по частям).
+    Nx = max(int(round(L / h)), 2)
+    steps_n = max(int(round(total_time / tau)), 1)
+    x = (np.arange(Nx + 1) * (L / Nx))[::decimate]
+    shape = (len(history_steps(steps_n, every)), len(x))
+
+    if out is None and path is not None:
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=shape)
+    elif out is None:
+        out = np.empty(shape)
+    elif out.shape != shape:
+        raise ValueError(f"out должен иметь форму {shape}, а не {out.shape}")
+
+    times = np.empty(shape[0])
+    for j, (t, snapshot) in enumerate(iter_history(rho, c, lam, Ta, Tn, T0, L, h, total_time, tau,
+                                                   every, decimate)):
+        times[j] = t
+        out[j] = snapshot
+
+    if isinstance(out, np.memmap):
+        out.flush()
+    return times, x, out
+
+
 # ТОЖЕ САМОЕ ДЛЯ GUI
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def calculate_next_step(T, alpha, beta, A_i, B_i, C_i, Nx, rho, c, tau, Ta, Tn):
     alpha[0] = 0.0
     beta[0] = float(Ta)
@@ -63,4 +302,75 @@ def calculate_next_step(T, alpha, beta, A_i, B_i, C_i, Nx, rho, c, tau, Ta, Tn):
     for i in range(Nx - 1, 0, -1):
         T_next[i] = alpha[i] * T_next[i + 1] + beta[i]
 
-    return T_next
\ No newline at end of file
+    return T_next
+
+
+# МНОГО СТЕРЖНЕЙ СРАЗУ
+@jit(nopython=True, parallel=True, cache=True)
+def simulate_batch_kernel(rho, c, lam, Ta, Tn, T0, L, h, total_time, tau):
+    # Все аргументы — массивы длины B, у каждого стержня свой материал, границы и сетка.
+    # Температуры лежат строками T[b, :Nx[b] + 1], стержни считаются параллельно.
+    B = len(rho)
+    Nx = np.empty(B, np.int64)
+    for b in range(B):
+        Nx[b] = max(int(round(L[b] / h[b])), 2)
+
+    T = np.zeros((B, Nx.max() + 1))
+    centers = np.empty(B)
+
+    for b in prange(B):
+        n = Nx[b]
+        hb = L[b] / n
+
+        steps_n = max(int(round(total_time[b] / tau[b])), 1)
+
+        A_i = lam[b] / hb**2
+        C_i = A_i
+        B_i = (2 * lam[b] / hb**2) + (rho[b] * c[b] / tau[b])
+
+        Tb = T[b]
+        Tb[:n + 1] = T0[b]
+        Tb[0] = Ta[b]
+        Tb[n] = Tn[b]
+
+        alpha, inv_den = factorize(n, A_i, B_i, C_i)
+        beta = np.empty(n + 1)
+        Tn_b = Tb[:n + 1]
+
+        for step in range(steps_n):
+            solve_factored(Tn_b, rho[b] * c[b] / tau[b], alpha, inv_den, C_i, Ta[b], Tn[b], beta, Tn_b)
+
+        centers[b] = Tb[n // 2]
+
+    return T, centers, Nx
+
+
+def simulate_batch(rho, c, lam, Ta, Tn, T0, L, h, total_time, tau):
+    # Числа и массивы можно смешивать: скаляры размножаются на все стержни
+    args = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64) for a in (rho, c, lam, Ta, Tn, T0, L, h, total_time, tau)))
+    return simulate_batch_kernel(*(np.ascontiguousarray(a.ravel()) for a in args))
+
+
+# ПРОГРЕВ
+# Ядра объявлены с cache=True: скомпилированный код лежит в __pycache__ и при
+# следующем запуске (и в процессах пула таблицы) загружается с диска. warmup()
+# готовит его заранее под те типы, с которыми ядра вызывают app и table_engine.
+SIGNATURES = [
+    (factorize, ["(i8, f8, f8, f8)"]),
+    (solve_factored, ["(f8[::1], f8, f8[::1], f8[::1], f8, f8, f8, f8[::1], f8[::1])"]),
+    (run_steps, ["(f8[::1], f8, f8[::1], f8[::1], f8, f8, f8, i8)"]),
+    (simulate, ["(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)"]),
+    (simulate_steady, ["(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)"]),
+    (steady_state, ["(f8, f8, f8, f8, f8)"]),
+    (simulate_cn, ["(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)"]),
+    (simulate_bdf2, ["(f8, f8, f8, f8, f8, f8, f8, f8, f8, f8)"]),
+    (calculate_next_step, ["(f8[::1], f8[::1], f8[::1], f8, f8, f8, i8, f8, f8, f8, f8, f8)"]),
+]
+
+
+def warmup():
+    start = time.perf_counter()
+    for kernel, signatures in SIGNATURES:
+        for signature in signatures:
+            kernel.compile(signature)
+    return time.perf_counter() - start
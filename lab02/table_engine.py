@@ -0,0 +1,70 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from solver import SCHEMES
+
+
+def run_cell(params, h, dt, total_time, scheme="implicit"):
+    _, center = SCHEMES[scheme](params["rho"], params["c"], params["lam"],
+                         params["Ta"], params["Tn"], params["T0"],
+                         params["L"], h, total_time, dt)
+    return center
+
+
+def cell_cost(params, h, dt, total_time):
+    # Число шагов на число узлов — столько раз выполняется тело прогонки
+    return (total_time / dt) * (params["L"] / h)
+
+
+class TableEngine:
+    # Ячейки таблицы (dt, h) считаются в пуле процессов, самые дорогие первыми.
+    # Колбэки вызываются из потоков пула, GUI передаёт их в root.after
+    # и сверяет run_id, который вернул start, с текущим: вызовы, уже стоящие
+    # в очереди GUI после cancel или нового запуска, должны отбрасываться.
+    def __init__(self, workers=None):
+        self.workers = workers
+        self.pool = None
+        self.run_id = 0
+        self.lock = threading.Lock()
+
+    def start(self, params, dts, hs, total_time, on_cell, on_progress=None, on_done=None,
+              scheme="implicit"):
+        self.cancel()
+        run_id = self.run_id
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+        cells = sorted(((dt, h) for dt in dts for h in hs),
+                       key=lambda cell: cell_cost(params, cell[1], cell[0], total_time), reverse=True)
+        total = len(cells)
+        done = [0]
+
+        def collect(future, dt, h):
+            # Результаты отменённого запуска не попадают в новую таблицу
+            if future.cancelled() or run_id != self.run_id:
+                return
+            try:
+                on_cell(dt, h, future.result(), None)
+            except Exception as e:
+                on_cell(dt, h, None, f"{type(e).__name__}: {e}")
+
+            with self.lock:
+                done[0] += 1
+                finished = done[0] == total
+            if on_progress is not None:
+                on_progress(done[0], total)
+            if finished and on_done is not None:
+                on_done()
+
+        for dt, h in cells:
+            future = self.pool.submit(run_cell, params, h, dt, total_time, scheme)
+            future.add_done_callback(lambda f, dt=dt, h=h: collect(f, dt, h))
+        return run_id
+
+    def cancel(self):
+        # Ожидающие ячейки снимаются; уже идущие досчитываются в фоне,
+        # но их результаты отбрасываются
+        self.run_id += 1
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
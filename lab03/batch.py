@@ -0,0 +1,160 @@
+import argparse
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+import fire_kernel
+from checkpoint import CheckpointWriter
+from fire_model import TREE, FIRE, ASH, WATER, ASH_DECAY, BURN_TIME, random_grid, step
+
+# Пакетный прогон модели пожара без окна:
+#   python batch.py --spread 0.2 0.35 0.5 --humidity 0 0.2 --wind 0,0 1,0 --seeds 100 --out sweep
+#
+# Результат — папка со столбцами:
+#   runs.csv           параметры каждого прогона и смещение его строк в столбцах
+#   tree.i4 fire.i4 ash.i4   число клеток TREE/FIRE/ASH на каждом шаге (int32)
+#   checkpoints/run_NNNNN.ckp  контрольные точки (--checkpoint-every), см. checkpoint.Replay
+#
+# --engine numba считает шаги ядром fire_kernel: прогон полностью определяется seed,
+# и Replay может восстановить любой шаг между контрольными точками.
+
+COLUMNS = {"tree": TREE, "fire": FIRE, "ash": ASH}
+PARAMS = ["base_fire_spread", "humidity", "tree_growth", "lightning_prob"]
+
+
+def param_grid(**values):
+    names = list(values)
+    for combo in itertools.product(*(values[name] for name in names)):
+        yield dict(zip(names, combo))
+
+
+def count_states(grid):
+    counts = np.bincount(grid.ravel(), minlength=WATER + 1)
+    return [counts[state] for state in COLUMNS.values()]
+
+
+def run(params, seed, steps, size, ash_decay=ASH_DECAY, burn_time=BURN_TIME,
+        engine="numpy", checkpoint=None, checkpoint_every=10):
+    rng = np.random.default_rng(seed)
+    grid = random_grid(size, rng)
+    burn_grid = np.zeros((size, size), dtype=np.int16)
+    grid[size // 2, size // 2] = FIRE
+
+    params = dict(params, ash_decay=ash_decay, burn_time=burn_time)
+    writer = None
+    if checkpoint:
+        writer = CheckpointWriter(checkpoint, grid.shape, every=checkpoint_every,
+                                  seed=seed if engine == "numba" else None)
+
+    counts = np.empty((steps + 1, len(COLUMNS)), dtype=np.int32)
+    counts[0] = count_states(grid)
+
+    for i in range(1, steps + 1):
+        if writer:
+            writer.record(i - 1, grid, burn_grid, params)
+        if engine == "numba":
+            grid, burn_grid = fire_kernel.step(grid, burn_grid, seed, i - 1, **params)
+        else:
+            grid, burn_grid = step(grid, burn_grid, rng, **params)
+        counts[i] = count_states(grid)
+
+    if writer:
+        writer.record(steps, grid, burn_grid, params, force=True)
+        writer.close()
+
+    return counts
+
+
+def sweep(out, combos, seeds, steps, size, workers=None, engine="numpy", checkpoint_every=None):
+    os.makedirs(out, exist_ok=True)
+    if checkpoint_every:
+        os.makedirs(os.path.join(out, "checkpoints"), exist_ok=True)
+
+    columns = {name: open(os.path.join(out, name + ".i4"), "wb") for name in COLUMNS}
+    with open(os.path.join(out, "runs.csv"), "w", newline="") as index_file:
+        index = csv.writer(index_file)
+        index.writerow(["run", "seed"] + PARAMS + ["wind_x", "wind_y", "offset", "steps"])
+
+        jobs = [(params, seed) for params in combos for seed in seeds]
+        offset = 0
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {}
+            for i, (params, seed) in enumerate(jobs):
+                checkpoint = os.path.join(out, "checkpoints", f"run_{i:05d}.ckp") if checkpoint_every else None
+                future = pool.submit(run, params, seed, steps, size, engine=engine,
+                                     checkpoint=checkpoint, checkpoint_every=checkpoint_every)
+                futures[future] = i
+
+            # Прогоны пишутся по мере завершения, порядок восстанавливается по runs.csv
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                params, seed = jobs[i]
+                counts = future.result()
+
+                for j, f in enumerate(columns.values()):
+                    counts[:, j].astype("<i4").tofile(f)
+                    f.flush()
+
+                index.writerow([i, seed] + [params[name] for name in PARAMS]
+                               + list(params["wind"]) + [offset, len(counts)])
+                index_file.flush()
+                offset += len(counts)
+
+                print(f"\r{done}/{len(jobs)}", end="", flush=True)
+        print()
+
+    for f in columns.values():
+        f.close()
+
+
+def load_results(out):
+    with open(os.path.join(out, "runs.csv"), newline="") as f:
+        runs = list(csv.DictReader(f))
+
+    columns = {}
+    for name in COLUMNS:
+        path = os.path.join(out, name + ".i4")
+        columns[name] = np.memmap(path, dtype="<i4", mode="r") if os.path.getsize(path) else np.empty(0, "<i4")
+    return runs, columns
+
+
+def run_counts(run_row, columns, name):
+    start = int(run_row["offset"])
+    return columns[name][start:start + int(run_row["steps"])]
+
+
+def parse_wind(text):
+    x, y = text.split(",")
+    return int(x), int(y)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетное моделирование лесного пожара")
+    parser.add_argument("--spread", type=float, nargs="+", default=[0.35])
+    parser.add_argument("--humidity", type=float, nargs="+", default=[0.2])
+    parser.add_argument("--growth", type=float, nargs="+", default=[0.002])
+    parser.add_argument("--lightning", type=float, nargs="+", default=[0.00005])
+    parser.add_argument("--wind", type=parse_wind, nargs="+", default=[(0, 0)])
+    parser.add_argument("--seeds", type=int, default=10, help="число прогонов на набор параметров")
+    parser.add_argument("--seed-base", type=int, default=0)
+    parser.add_argument("--steps", type=int, default=300)
+    parser.add_argument("--size", type=int, default=180)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", default="sweep")
+    parser.add_argument("--engine", choices=["numpy", "numba"], default="numpy")
+    parser.add_argument("--checkpoint-every", type=int, default=None, help="контрольная точка каждые N шагов")
+    args = parser.parse_args()
+
+    combos = list(param_grid(base_fire_spread=args.spread, humidity=args.humidity,
+                             tree_growth=args.growth, lightning_prob=args.lightning, wind=args.wind))
+    seeds = range(args.seed_base, args.seed_base + args.seeds)
+
+    sweep(args.out, combos, seeds, args.steps, args.size, args.workers, args.engine, args.checkpoint_every)
+
+
+if __name__ == "__main__":
+    main()
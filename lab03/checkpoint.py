@@ -0,0 +1,194 @@
+import json
+import mmap
+import struct
+import zlib
+
+import numpy as np
+
+import fire_kernel
+
+# Файл контрольных точек пожара:
+#   MAGIC | записи ... | индекс (JSON) | смещение индекса (8 байт) | MAGIC
+# Запись — сжатые zlib байты grid и burn_grid. Ключевой кадр хранит их целиком,
+# дельта — XOR с предыдущей контрольной точкой (неизменные клетки дают нули и
+# почти ничего не весят). Файл читается через mmap: в память попадают только
+# записи, нужные для перемотки.
+
+MAGIC = b"FIRECKP1"
+FOOTER = struct.Struct("<Q8s")
+
+KEYFRAME, DELTA = "key", "delta"
+
+
+def xor_bytes(a, b):
+    return np.bitwise_xor(np.frombuffer(a, np.uint8), np.frombuffer(b, np.uint8)).tobytes()
+
+
+class CheckpointWriter:
+    def __init__(self, path, shape, every=10, keyframe_every=10, seed=None,
+                 grid_dtype=np.int8, burn_dtype=np.int16, level=6):
+        self.file = open(path, "wb")
+        self.file.write(MAGIC)
+        self.every = every
+        self.keyframe_every = keyframe_every
+        self.level = level
+        self.shape = tuple(shape)
+        self.grid_dtype = np.dtype(grid_dtype)
+        self.burn_dtype = np.dtype(burn_dtype)
+        self.header = {
+            "shape": list(shape),
+            "grid_dtype": self.grid_dtype.str,
+            "burn_dtype": self.burn_dtype.str,
+            "seed": seed,
+            "every": every,
+        }
+        self.records = []
+        self.prev = None
+        self.params = None
+
+    def record(self, step_no, grid, burn_grid, params, force=False):
+        # params — параметры, с которыми модель пойдёт дальше с этого шага.
+        # Если они поменялись, точка пишется вне расписания: между точками
+        # параметры постоянны, и replay может досчитать промежуточные шаги.
+        if step_no % self.every and params == self.params and not force:
+            return
+        self.params = dict(params)
+
+        if grid.shape != self.shape or burn_grid.shape != self.shape:
+            raise ValueError(f"размер поля {grid.shape}, в заголовке {self.shape}")
+        # Байты пишутся в типах из заголовка, иначе replay прочтёт мусор
+        grid = np.ascontiguousarray(grid, self.grid_dtype)
+        burn_grid = np.ascontiguousarray(burn_grid, self.burn_dtype)
+        data = grid.tobytes() + burn_grid.tobytes()
+        if self.prev is None or len(self.records) % self.keyframe_every == 0:
+            kind, payload = KEYFRAME, data
+        else:
+            kind, payload = DELTA, xor_bytes(data, self.prev)
+        self.prev = data
+
+        blob = zlib.compress(payload, self.level)
+        self.records.append({
+            "step": step_no,
+            "kind": kind,
+            "offset": self.file.tell(),
+            "length": len(blob),
+            "params": {k: list(v) if isinstance(v, tuple) else v for k, v in params.items()},
+        })
+        self.file.write(blob)
+
+    def close(self):
+        index_offset = self.file.tell()
+        self.file.write(json.dumps({"header": self.header, "records": self.records}).encode())
+        self.file.write(FOOTER.pack(index_offset, MAGIC))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Replay:
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        index_offset, magic = FOOTER.unpack(self.data[-FOOTER.size:])
+        if self.data[:len(MAGIC)] != MAGIC or magic != MAGIC:
+            raise ValueError(f"{path}: не файл контрольных точек")
+
+        index = json.loads(self.data[index_offset:len(self.data) - FOOTER.size])
+        self.header = index["header"]
+        self.records = index["records"]
+        for rec in self.records:
+            if "wind" in rec["params"]:
+                rec["params"]["wind"] = tuple(rec["params"]["wind"])
+
+        self.shape = tuple(self.header["shape"])
+        self.grid_dtype = np.dtype(self.header["grid_dtype"])
+        self.burn_dtype = np.dtype(self.header["burn_dtype"])
+        self.grid_size = int(np.prod(self.shape)) * self.grid_dtype.itemsize
+
+        self.steps = [rec["step"] for rec in self.records]
+        self.cached = None  # (номер записи, байты состояния)
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def payload(self, i):
+        rec = self.records[i]
+        return zlib.decompress(self.data[rec["offset"]:rec["offset"] + rec["length"]])
+
+    def checkpoint_bytes(self, i):
+        # От ближайшего ключевого кадра (или закэшированной точки) применяем дельты
+        start = i
+        while self.records[start]["kind"] != KEYFRAME:
+            start -= 1
+
+        if self.cached is not None and start <= self.cached[0] <= i:
+            j, state = self.cached
+        else:
+            j, state = start, self.payload(start)
+
+        for k in range(j + 1, i + 1):
+            state = xor_bytes(state, self.payload(k))
+
+        self.cached = (i, state)
+        return state
+
+    def checkpoint(self, i):
+        state = self.checkpoint_bytes(i)
+        grid = np.frombuffer(state, self.grid_dtype, count=int(np.prod(self.shape))).reshape(self.shape)
+        burn = np.frombuffer(state, self.burn_dtype, offset=self.grid_size).reshape(self.shape)
+        return grid.copy(), burn.copy(), dict(self.records[i]["params"])
+
+    def state_at(self, step_no):
+        # Состояние после step_no шагов: ближайшая точка не позже step_no,
+        # дальше шаги досчитываются numba-ядром по сохранённому seed
+        i = np.searchsorted(self.steps, step_no, side="right") - 1
+        if i < 0:
+            raise ValueError(f"шаг {step_no} раньше первой контрольной точки {self.steps[0]}")
+
+        grid, burn_grid, params = self.checkpoint(i)
+        start = self.steps[i]
+        if start == step_no:
+            return grid, burn_grid, params
+
+        seed = self.header["seed"]
+        if seed is None:
+            raise ValueError(f"шаг {step_no} не сохранён, а без seed его нельзя пересчитать")
+
+        for s in range(start, step_no):
+            grid, burn_grid = fire_kernel.step(grid, burn_grid, seed, s, **params)
+        return grid, burn_grid, params
+
+    def frames(self, start, stop):
+        # Последовательный просмотр: перематываем один раз, дальше считаем шаги.
+        # Без seed доступны только сами контрольные точки.
+        seed = self.header["seed"]
+        if seed is None:
+            for i, s in enumerate(self.steps):
+                if start <= s < stop:
+                    grid, burn_grid, _ = self.checkpoint(i)
+                    yield s, grid, burn_grid
+            return
+
+        grid, burn_grid, params = self.state_at(start)
+        yield start, grid, burn_grid
+
+        i = np.searchsorted(self.steps, start, side="right")
+        for s in range(start + 1, stop):
+            if i < len(self.steps) and self.steps[i] == s:
+                grid, burn_grid, params = self.checkpoint(i)
+                i += 1
+            else:
+                grid, burn_grid = fire_kernel.step(grid, burn_grid, seed, s - 1, **params)
+            yield s, grid, burn_grid
@@ -0,0 +1,98 @@
+import numpy as np
+from numba import jit, prange
+
+from fire_model import EMPTY, TREE, FIRE, ASH, WATER, NEIGHBOURS, WATER_FACTOR, ASH_DECAY, BURN_TIME, spread_probabilities
+
+DX = np.array([dx for dx, dy in NEIGHBOURS])
+DY = np.array([dy for dx, dy in NEIGHBOURS])
+
+# Константы splitmix64
+GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+MIX_2 = np.uint64(0x94D049BB133111EB)
+KEY_X = np.uint64(0xD1B54A32D192ED03)
+KEY_Y = np.uint64(0xABC98388FB8FAC03)
+
+
+@jit(nopython=True)
+def mix64(z):
+    z = (z ^ (z >> np.uint64(30))) * MIX_1
+    z = (z ^ (z >> np.uint64(27))) * MIX_2
+    return z ^ (z >> np.uint64(31))
+
+
+@jit(nopython=True)
+def cell_random(seed, step_no, x, y):
+    # Счётчиковый генератор: число зависит только от (seed, step, x, y),
+    # поэтому результат не зависит от порядка обхода и числа потоков
+    z = mix64(np.uint64(seed) * GOLDEN + np.uint64(step_no))
+    z = mix64(z ^ (np.uint64(x) * KEY_X))
+    z = mix64(z ^ (np.uint64(y) * KEY_Y))
+    return (z >> np.uint64(11)) * (1.0 / 9007199254740992.0)
+
+
+@jit(nopython=True, parallel=True)
+def step_kernel(grid, burn_grid, new_grid, new_burn, probs, seed, step_no,
+                tree_growth, lightning_prob, ash_decay, burn_time):
+    n, m = grid.shape
+
+    for x in prange(n):
+        for y in range(m):
+            state = grid[x, y]
+            new_grid[x, y] = state
+            new_burn[x, y] = burn_grid[x, y]
+
+            r = cell_random(seed, step_no, x, y)
+
+            if state == FIRE:
+                new_burn[x, y] += 1
+                if new_burn[x, y] >= burn_time:
+                    new_grid[x, y] = ASH
+                    new_burn[x, y] = 0
+
+            elif state == ASH:
+                if r < ash_decay:
+                    new_grid[x, y] = EMPTY
+
+            elif state == EMPTY:
+                if r < tree_growth:
+                    new_grid[x, y] = TREE
+
+            elif state == TREE:
+                near_fire = False
+                for k in range(8):
+                    nx = x + DX[k]
+                    ny = y + DY[k]
+                    if 0 <= nx < n and 0 <= ny < m and grid[nx, ny] == FIRE:
+                        near_fire = True
+                        break
+
+                no_fire = 1.0
+                if near_fire:
+                    water_mult = 1.0
+                    for wx in range(x - 1, x + 2):
+                        for wy in range(y - 1, y + 2):
+                            if 0 <= wx < n and 0 <= wy < m and grid[wx, wy] == WATER:
+                                water_mult *= WATER_FACTOR
+
+                    for k in range(8):
+                        nx = x + DX[k]
+                        ny = y + DY[k]
+                        if 0 <= nx < n and 0 <= ny < m and grid[nx, ny] == FIRE:
+                            p = min(max(probs[k] * water_mult, 0.0), 1.0)
+                            no_fire *= 1.0 - p
+
+                if r < 1.0 - (1.0 - lightning_prob) * no_fire:
+                    new_grid[x, y] = FIRE
+                    new_burn[x, y] = 1
+
+
+def step(grid, burn_grid, seed, step_no, base_fire_spread, humidity, tree_growth,
+         lightning_prob, wind, ash_decay=ASH_DECAY, burn_time=BURN_TIME):
+    # То же, что fire_model.step, но вместо rng — ключ (seed, step_no)
+    probs = np.array(spread_probabilities(base_fire_spread, humidity, wind))
+    new_grid = np.empty_like(grid)
+    new_burn = np.empty_like(burn_grid)
+    step_kernel(grid, burn_grid, new_grid, new_burn, probs, seed, step_no,
+                tree_growth, lightning_prob, ash_decay, burn_time)
+    return new_grid, new_burn
@@ -0,0 +1,223 @@
+import numpy as np
+
+EMPTY, TREE, FIRE, ASH, WATER = 0, 1, 2, 3, 4
+
+WIND_STRENGTH = 0.8
+DIAGONAL_FACTOR = 0.7
+WATER_FACTOR = 0.5
+
+ASH_DECAY = 0.02
+BURN_TIME = 3
+
+NEIGHBOURS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (dx, dy) != (0, 0)]
+AROUND = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+
+
+def random_grid(size, rng, p_tree=0.6):
+    return rng.choice([EMPTY, TREE], size=(size, size), p=[1 - p_tree, p_tree]).astype(np.int8)
+
+
+def spread_probabilities(base_fire_spread, humidity, wind):
+    # Вероятность поджога от соседа (dx, dy) без учёта воды
+    probs = []
+    for dx, dy in NEIGHBOURS:
+        prob = base_fire_spread
+
+        if abs(dx) + abs(dy) == 2:
+            prob *= DIAGONAL_FACTOR
+
+        if wind != (0, 0):
+            wind_len = (wind[0]**2 + wind[1]**2)**0.5
+            dir_len = (dx**2 + dy**2)**0.5
+            dot = (wind[0] * -dx + wind[1] * -dy) / (wind_len * dir_len)
+            prob += dot * WIND_STRENGTH
+
+        prob *= 1 - humidity
+        probs.append(prob)
+    return probs
+
+
+def neighbour_states(grid, xs, ys, dx, dy):
+    # Состояния соседей (xs + dx, ys + dy); за границей поля — EMPTY
+    n, m = grid.shape
+    nx = xs + dx
+    ny = ys + dy
+    inside = (nx >= 0) & (nx < n) & (ny >= 0) & (ny < m)
+    states = grid.ravel()[np.where(inside, nx * m + ny, 0)]
+    return np.where(inside, states, EMPTY)
+
+
+def ignition_chance(grid, xs, ys, probs):
+    # Вероятность НЕ загореться для деревьев (xs, ys):
+    # каждый горящий сосед поджигает независимо, вода рядом ослабляет огонь
+    n_water = np.zeros(len(xs), dtype=np.int8)
+    for dx, dy in AROUND:
+        n_water += neighbour_states(grid, xs, ys, dx, dy) == WATER
+    water_mult = WATER_FACTOR ** n_water
+
+    no_fire = np.ones(len(xs))
+    for (dx, dy), prob in zip(NEIGHBOURS, probs):
+        burning = neighbour_states(grid, xs, ys, dx, dy) == FIRE
+        p = np.clip(prob * water_mult, 0.0, 1.0)
+        no_fire *= np.where(burning, 1.0 - p, 1.0)
+    return no_fire
+
+
+def shifted(padded, dx, dy):
+    # Окно поля с отступом 1, сдвинутое на (dx, dy): в клетке (x, y) — сосед (x + dx, y + dy)
+    n, m = padded.shape[0] - 2, padded.shape[1] - 2
+    return padded[1 + dx:1 + dx + n, 1 + dy:1 + dy + m]
+
+
+def ignition_table(probs):
+    # Вероятность загореться от соседей для каждого набора горящих соседей
+    # (бит d — сосед NEIGHBOURS[d]) и числа клеток воды вокруг:
+    # индекс code * len(AROUND) + n_water
+    bits = (np.arange(1 << len(NEIGHBOURS))[:, None] >> np.arange(len(NEIGHBOURS))) & 1
+    water_mult = WATER_FACTOR ** np.arange(len(AROUND))
+    p = np.clip(np.outer(water_mult, probs), 0.0, 1.0)
+    no_fire = np.where(bits[:, None, :] == 1, 1.0 - p, 1.0).prod(axis=2)
+    return (1.0 - no_fire).ravel()
+
+
+def step(grid, burn_grid, rng, base_fire_spread, humidity, tree_growth,
+         lightning_prob, wind, ash_decay=ASH_DECAY, burn_time=BURN_TIME):
+    n, m = grid.shape
+    cells = grid.ravel()
+    fire = grid == FIRE
+    burning = fire.any()
+
+    new_grid = grid.copy()
+    new_burn = burn_grid.copy()
+    new_cells = new_grid.ravel()
+
+    # Горение и выгорание
+    if burning:
+        new_burn += fire
+        burnt = fire & (new_burn >= burn_time)
+        np.copyto(new_grid, ASH, where=burnt)
+        np.copyto(new_burn, 0, where=burnt)
+
+    # Редкие события без случайного поля на всю сетку: пепел рассыпается,
+    # на пустом месте вырастает лес, в дерево бьёт молния
+    decay = sample_cells(rng, cells.size, ash_decay)
+    new_cells[decay[cells[decay] == ASH]] = EMPTY
+    growth = sample_cells(rng, cells.size, tree_growth)
+    new_cells[growth[cells[growth] == EMPTY]] = TREE
+    lightning = sample_cells(rng, cells.size, lightning_prob)
+    ignite = lightning[cells[lightning] == TREE]
+
+    # Деревья рядом с огнём. Код горящих соседей и число клеток воды вокруг
+    # считаются сдвинутыми срезами по всему полю, вероятность берётся из таблицы.
+    # Молния независима от соседей: P = 1 - (1 - молния) * P(ни один сосед не поджёг)
+    if burning:
+        fire_pad = np.pad(fire, 1).view(np.uint8)
+        code = np.zeros((n, m), np.uint8)
+        for bit, (dx, dy) in enumerate(NEIGHBOURS):
+            # Умножение на 2^bit в uint8 заметно быстрее сдвига
+            code |= shifted(fire_pad, dx, dy) * np.uint8(1 << bit)
+        near = np.flatnonzero((grid == TREE) & (code != 0))
+
+        water_pad = np.pad(grid == WATER, 1).view(np.uint8)
+        rows = water_pad[:, :-2] + water_pad[:, 1:-1] + water_pad[:, 2:]
+        n_water = rows[:-2] + rows[1:-1] + rows[2:]
+
+        table = ignition_table(spread_probabilities(base_fire_spread, humidity, wind))
+        index = code.ravel()[near].astype(np.intp) * len(AROUND) + n_water.ravel()[near]
+        caught = near[rng.random(len(near)) < table[index]]
+        ignite = distinct(np.concatenate([ignite, caught]))
+
+    new_cells[ignite] = FIRE
+    new_burn.ravel()[ignite] = 1
+
+    return new_grid, new_burn
+
+
+def distinct(values):
+    # Отсортированные значения без повторов: то же, что np.unique, но через
+    # обычную сортировку — np.unique на целых здесь в десятки раз медленнее
+    values = np.sort(values)
+    if len(values) < 2:
+        return values
+    return values[np.concatenate(([True], values[1:] != values[:-1]))]
+
+
+def sample_cells(rng, size, prob):
+    # Клетки, с которыми произошло событие с вероятностью prob. Частые события
+    # дешевле отметить случайным полем на всю сетку. Для редких число событий
+    # берётся из биномиального распределения, сами клетки — случайные индексы
+    # без повторов; повторы выбрасываются и добираются заново, это O(k log k),
+    # тогда как rng.choice(replace=False) при больших k строит arange(size)
+    if prob > 0.1:
+        return np.flatnonzero(rng.random(size, dtype=np.float32) < prob)
+    k = rng.binomial(size, prob)
+    cells = distinct(rng.integers(0, size, k))
+    while len(cells) < k:
+        cells = distinct(np.concatenate([cells, rng.integers(0, size, k - len(cells))]))
+    return cells
+
+
+class FireFront:
+    # Разреженный режим: хранятся только индексы горящих клеток и пепла, шаг обходит
+    # фронт пожара, его соседей и пепел, который этот фронт оставил, а не всё поле.
+    # grid и burn_grid меняются на месте; клетки, ставшие пеплом снаружи, не затухают.
+    def __init__(self, grid, burn_grid):
+        self.grid = grid
+        self.burn_grid = burn_grid
+        self.fire = np.flatnonzero(grid == FIRE)
+        self.ash = np.flatnonzero(grid == ASH)
+
+    def ignite(self, x, y):
+        self.grid[x, y] = FIRE
+        self.fire = np.append(self.fire, x * self.grid.shape[1] + y)
+
+    def step(self, rng, base_fire_spread, humidity, tree_growth,
+             lightning_prob, wind, ash_decay=ASH_DECAY, burn_time=BURN_TIME):
+        n, m = self.grid.shape
+        cells = self.grid.ravel()
+        burn = self.burn_grid.ravel()
+
+        # Клетки могли поменяться снаружи (например, залиты водой)
+        fire = np.unique(self.fire)
+        fire = fire[cells[fire] == FIRE]
+
+        # Деревья рядом с фронтом
+        xs, ys = fire // m, fire % m
+        near = []
+        for dx, dy in NEIGHBOURS:
+            nx, ny = xs + dx, ys + dy
+            inside = (nx >= 0) & (nx < n) & (ny >= 0) & (ny < m)
+            near.append((nx * m + ny)[inside])
+        near = np.concatenate(near)
+        near = np.unique(near[cells[near] == TREE])
+
+        probs = spread_probabilities(base_fire_spread, humidity, wind)
+        no_fire = ignition_chance(self.grid, near // m, near % m, probs)
+        caught = near[rng.random(len(near)) < 1 - no_fire]
+
+        # Пепел затухает только там, где он есть
+        ash = self.ash[cells[self.ash] == ASH]
+        decayed = rng.random(len(ash)) < ash_decay
+        decay = ash[decayed]
+
+        # Редкие события по всему полю
+        lightning = sample_cells(rng, cells.size, lightning_prob)
+        lightning = lightning[cells[lightning] == TREE]
+        growth = sample_cells(rng, cells.size, tree_growth)
+        growth = growth[cells[growth] == EMPTY]
+
+        # Все условия проверены по старому состоянию, теперь применяем
+        burn[fire] += 1
+        burnt = burn[fire] >= burn_time
+        cells[fire[burnt]] = ASH
+        burn[fire[burnt]] = 0
+
+        cells[decay] = EMPTY
+        cells[growth] = TREE
+
+        ignite = np.union1d(caught, lightning)
+        cells[ignite] = FIRE
+        burn[ignite] = 1
+
+        self.fire = np.concatenate([fire[~burnt], ignite])
+        self.ash = np.concatenate([ash[~decayed], fire[burnt]])
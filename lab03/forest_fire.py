@@ -1,6 +1,8 @@
 import pygame
 import numpy as np
 import random
+import fire_kernel
+from fire_model import EMPTY, TREE, FIRE, ASH, WATER, ASH_DECAY, BURN_TIME, FireFront, random_grid, step
 
 pygame.init()
 
@@ -10,15 +12,12 @@ HEIGHT = 800
 WIDTH = MENU_WIDTH + SIM_WIDTH
 
 GRID_SIZE = 180
-CELL_SIZE = SIM_WIDTH // GRID_SIZE
 
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
 pygame.display.set_caption("Симулятор лесного пожара")
 
 clock = pygame.time.Clock()
 
-EMPTY, TREE, FIRE, ASH, WATER = 0, 1, 2, 3, 4
-
 COLORS = {
     EMPTY: (25,25,35),
     TREE: (40,160,60),
@@ -27,6 +26,13 @@ COLORS = {
     WATER: (40,120,255)
 }
 
+PALETTE = np.zeros((len(COLORS),3), dtype=np.uint8)
+for state,color in COLORS.items():
+    PALETTE[state] = color
+
+grid_surface = pygame.Surface((GRID_SIZE, GRID_SIZE))
+sim_surface = pygame.Surface((SIM_WIDTH, SIM_WIDTH))
+
 base_fire_spread = 0.35
 humidity = 0.2
 tree_growth = 0.002
@@ -35,11 +41,22 @@ fps = 60
 wind = (0,0)
 paused = False
 
-ash_decay = 0.02
-burn_time = 3
+ash_decay = ASH_DECAY
+burn_time = BURN_TIME
+
+rng = np.random.default_rng()
 
-grid = np.random.choice([EMPTY, TREE], size=(GRID_SIZE, GRID_SIZE), p=[0.4,0.6])
-burn_grid = np.zeros((GRID_SIZE, GRID_SIZE))
+grid = random_grid(GRID_SIZE, rng)
+burn_grid = np.zeros((GRID_SIZE, GRID_SIZE), dtype=np.int16)
+
+# Режим счёта (клавиша F): всё поле, только фронт пожара или numba-ядро
+MODES = ["всё поле", "фронт", "numba"]
+mode = 0
+front = None
+
+# numba-ядро воспроизводимо: случайные числа зависят только от (seed, шаг, x, y)
+seed = int(rng.integers(2**32))
+step_no = 0
 
 font = pygame.font.SysFont("consolas",18)
 big_font = pygame.font.SysFont("consolas",22,bold=True)
@@ -118,132 +135,43 @@ Button(120,730,60,30,"•")
 
 def update_simulation():
 
-    global grid,burn_grid
-
-    new_grid=grid.copy()
-    new_burn=burn_grid.copy()
-
-    wind_strength=0.8
-
-    for x in range(GRID_SIZE):
-        for y in range(GRID_SIZE):
-
-            state=grid[x,y]
-
-            if state==FIRE:
-
-                new_burn[x,y]+=1
-
-                if new_burn[x,y]>=burn_time:
-                    new_grid[x,y]=ASH
-                    new_burn[x,y]=0
-
-
-            elif state==ASH:
-
-                if random.random()<ash_decay:
-                    new_grid[x,y]=EMPTY
-
-
-            elif state==EMPTY:
-
-                if random.random()<tree_growth:
-                    new_grid[x,y]=TREE
-
-
-            elif state==TREE:
-
-                if random.random()<lightning_prob:
-                    new_grid[x,y]=FIRE
-                    new_burn[x,y]=1
-                    continue
-
-                catch_fire=False
-
-                for dx in [-1,0,1]:
-                    for dy in [-1,0,1]:
-
-                        if dx==0 and dy==0:
-                            continue
+    global grid,burn_grid,step_no
 
-                        nx=x+dx
-                        ny=y+dy
+    if MODES[mode]=="numba":
+        grid,burn_grid=fire_kernel.step(
+            grid,burn_grid,seed,step_no,
+            base_fire_spread,humidity,tree_growth,lightning_prob,wind,
+            ash_decay,burn_time
+        )
+        step_no+=1
+        return
 
-                        if 0<=nx<GRID_SIZE and 0<=ny<GRID_SIZE:
+    if front is not None:
+        front.step(
+            rng,
+            base_fire_spread,humidity,tree_growth,lightning_prob,wind,
+            ash_decay,burn_time
+        )
+        return
 
-                            if grid[nx,ny]==FIRE:
-
-                                prob=base_fire_spread
-
-                                if abs(dx)+abs(dy)==2:
-                                    prob*=0.7
-
-                                dir_x=-dx
-                                dir_y=-dy
-
-                                if wind!=(0,0):
-
-                                    wind_len=(wind[0]**2+wind[1]**2)**0.5
-                                    wind_x=wind[0]/wind_len
-                                    wind_y=wind[1]/wind_len
-
-                                    dir_len=(dir_x**2+dir_y**2)**0.5
-                                    dir_x/=dir_len
-                                    dir_y/=dir_len
-
-                                    dot=wind_x*dir_x+wind_y*dir_y
-
-                                    prob+=dot*wind_strength
-
-                                prob*=1-humidity
-
-                                for wx in [-1,0,1]:
-                                    for wy in [-1,0,1]:
-
-                                        cx=x+wx
-                                        cy=y+wy
-
-                                        if 0<=cx<GRID_SIZE and 0<=cy<GRID_SIZE:
-
-                                            if grid[cx,cy]==WATER:
-                                                prob*=0.5
-
-                                prob=max(0,min(1,prob))
-
-                                if random.random()<prob:
-                                    catch_fire=True
-                                    break
-
-                    if catch_fire:
-                        break
-
-                if catch_fire:
-                    new_grid[x,y]=FIRE
-                    new_burn[x,y]=1
-
-
-    grid=new_grid
-    burn_grid=new_burn
+    grid,burn_grid=step(
+        grid,burn_grid,rng,
+        base_fire_spread,humidity,tree_growth,lightning_prob,wind,
+        ash_decay,burn_time
+    )
 
 
 def draw_sim():
 
-    for x in range(GRID_SIZE):
-        for y in range(GRID_SIZE):
+    # Цвета всех клеток одной выборкой из таблицы, огонь мерцает шумом в зелёном канале
+    pixels=PALETTE[grid]
 
-            rect=pygame.Rect(
-                MENU_WIDTH+x*CELL_SIZE,
-                y*CELL_SIZE,
-                CELL_SIZE,
-                CELL_SIZE
-            )
+    fire=grid==FIRE
+    pixels[...,1][fire]=rng.integers(80,151,size=np.count_nonzero(fire),dtype=np.uint8)
 
-            color=COLORS[grid[x,y]]
-
-            if grid[x,y]==FIRE:
-                color=(255,random.randint(80,150),0)
-
-            pygame.draw.rect(screen,color,rect)
+    pygame.surfarray.blit_array(grid_surface,pixels)
+    pygame.transform.scale(grid_surface,(SIM_WIDTH,SIM_WIDTH),sim_surface)
+    screen.blit(sim_surface,(MENU_WIDTH,0))
 
 
 def draw_menu():
@@ -265,6 +193,9 @@ def draw_menu():
     wind_text=font.render(f"Wind: {wind}",True,(200,200,255))
     screen.blit(wind_text,(90,670))
 
+    mode_text=font.render(f"Режим: {MODES[mode]}",True,(160,160,180))
+    screen.blit(mode_text,(40,70))
+
 
 running=True
 
@@ -281,21 +212,28 @@ while running:
         for s in sliders:
             s.update(event)
 
+        if event.type==pygame.KEYDOWN and event.key==pygame.K_f:
+            mode=(mode+1)%len(MODES)
+            front=FireFront(grid,burn_grid) if MODES[mode]=="фронт" else None
+
         if buttons[0].clicked(event):
             paused=not paused
 
         if buttons[1].clicked(event):
 
-            grid=np.random.choice(
-                [EMPTY,TREE],
-                size=(GRID_SIZE,GRID_SIZE),
-                p=[0.4,0.6]
-            )
+            grid=random_grid(GRID_SIZE,rng)
+
+            if front is not None:
+                front=FireFront(grid,burn_grid)
 
         if buttons[2].clicked(event):
             x=random.randint(0,GRID_SIZE-1)
             y=random.randint(0,GRID_SIZE-1)
-            grid[x,y]=FIRE
+
+            if front is not None:
+                front.ignite(x,y)
+            else:
+                grid[x,y]=FIRE
 
         if buttons[3].clicked(event):
             x=random.randint(0,GRID_SIZE-1)
@@ -1,37 +1,45 @@
-import statistics
-import random
 import matplotlib.pyplot as plt
 import numpy as np
 
-# LCG генератор
-def lcg_random(seed=1, n=100000):
-    m = 2**32
-    a = 1664525
-    c = 1013904223
-    numbers = []
-    x = seed
-    for i in range(n):
-        x = (a * x + c) % m
-        numbers.append(x / m)
-    return numbers
-
-# Генерация данных
-lcg_nums = lcg_random()
-lcg_mean = statistics.mean(lcg_nums)
-lcg_var = statistics.variance(lcg_nums)
-
-random.seed(1)
-rand_nums = [random.random() for _ in range(100000)]
-rand_mean = statistics.mean(rand_nums)
-rand_var = statistics.variance(rand_nums)
-
-# Теоретические значения  мю=0.5, сигмакв=1/12
+# Генераторы из реестра generators.py: "lcg" — LCG этой работы,
+# "python" — та же последовательность, что random.seed(1) и random.random()
+from generators import make
+from moments import Moments
+
+LCG_GENERATOR = "lcg"
+RANDOM_GENERATOR = "python"
+SEED = 1
+
+N = 100000
+CHUNK = 10000
+
+
+def sample_moments(name):
+    # Моменты и гистограмма за один проход по кускам, сама выборка не хранится
+    gen = make(name, SEED)
+    moments = Moments(bins=50)
+    for start in range(0, N, CHUNK):
+        moments.update(gen.random(min(CHUNK, N - start)))
+    return moments
+
+
+lcg = sample_moments(LCG_GENERATOR)
+lcg_mean = lcg.mean
+lcg_var = lcg.variance(ddof=1)
+
+rand = sample_moments(RANDOM_GENERATOR)
+rand_mean = rand.mean
+rand_var = rand.variance(ddof=1)
+
+# Теоретические значения  мю=0.5, сигмакв=1/12, асимметрия 0, эксцесс -1.2
 theory_mean = 0.5
 theory_var = 1/12 
+theory_skew = 0.0
+theory_kurt = -1.2
 
 print("Результаты:")
-print(f"LCG: среднее={lcg_mean:.6f}, дисперсия={lcg_var:.6f}")
-print(f"random: среднее={rand_mean:.6f}, дисперсия={rand_var:.6f}")
+print(f"{LCG_GENERATOR}: среднее={lcg_mean:.6f}, дисперсия={lcg_var:.6f}")
+print(f"{RANDOM_GENERATOR}: среднее={rand_mean:.6f}, дисперсия={rand_var:.6f}")
 print(f"Теория: среднее={theory_mean:.6f}, дисперсия={theory_var:.6f}")
 
 # График с гистограммами и таблицей
@@ -39,14 +47,14 @@ fig = plt.figure(figsize=(14, 6))
 
 # Гистограммы
 ax1 = plt.subplot(1, 2, 1)
-ax1.hist(lcg_nums, bins=50, density=True, alpha=0.7, label='LCG', color='red', edgecolor='black')
-ax1.hist(rand_nums, bins=50, density=True, alpha=0.7, label='random', color='green', edgecolor='black')
+ax1.hist(lcg.edges[:-1], bins=lcg.edges, weights=lcg.density(), alpha=0.7, label=LCG_GENERATOR, color='red', edgecolor='black')
+ax1.hist(rand.edges[:-1], bins=rand.edges, weights=rand.density(), alpha=0.7, label=RANDOM_GENERATOR, color='green', edgecolor='black')
 
 # Теоретическая плотность U[0,1)
 x = np.linspace(0, 1, 100)
 ax1.plot(x, np.ones_like(x), 'r--', linewidth=2, label='Теоретическая плотность')
 
-ax1.set_title('Распределение случайных чисел (n=100000)')
+ax1.set_title(f'Распределение случайных чисел (n={N})')
 ax1.set_xlabel('Значение')
 ax1.set_ylabel('Плотность')
 ax1.legend()
@@ -59,16 +67,18 @@ ax2.axis('off')
 
 # Данные для таблицы
 table_data = [
-    ['Параметр', 'Теория', 'LCG', 'random'],
+    ['Параметр', 'Теория', LCG_GENERATOR, RANDOM_GENERATOR],
     ['Среднее', f'{theory_mean:.6f}', f'{lcg_mean:.6f}', f'{rand_mean:.6f}'],
-    ['Дисперсия', f'{theory_var:.6f}', f'{lcg_var:.6f}', f'{rand_var:.6f}']
+    ['Дисперсия', f'{theory_var:.6f}', f'{lcg_var:.6f}', f'{rand_var:.6f}'],
+    ['Асимметрия', f'{theory_skew:.6f}', f'{lcg.skewness():.6f}', f'{rand.skewness():.6f}'],
+    ['Эксцесс', f'{theory_kurt:.6f}', f'{lcg.kurtosis():.6f}', f'{rand.kurtosis():.6f}']
 ]
 
 # Создание таблицы
 table = ax2.table(cellText=table_data[1:], colLabels=table_data[0],
                   cellLoc='center', loc='center',
                   colColours=['#f0f0f0']*4,
-                  cellColours=[['#e6f3ff']*4]*2)
+                  cellColours=[['#e6f3ff']*4]*4)
 
 table.auto_set_font_size(False)
 table.set_fontsize(12)
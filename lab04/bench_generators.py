@@ -0,0 +1,53 @@
+import argparse
+import time
+
+from generators import GENERATORS, make, bits_per_number
+import randtests
+
+# Сравнение генераторов реестра: скорость, байты состояния на число и тесты
+# randtests.Battery. «Годен» — если ни один тест не дал p ниже порога
+# (с поправкой Бонферрони на число тестов).
+#   python bench_generators.py --n 1e7 --speed-n 1e7
+
+
+def throughput(name, n, chunk):
+    gen = make(name, 1)
+    gen.random(chunk)  # прогрев: таблицы LCG, буферы
+    start = time.perf_counter()
+    for done in range(0, n, chunk):
+        gen.random(min(chunk, n - done))
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Скорость и качество генераторов из generators.py")
+    parser.add_argument("--generators", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--speed-n", type=float, default=1e7, help="чисел для замера скорости")
+    parser.add_argument("--n", type=float, default=1e7, help="объём выборки для тестов")
+    parser.add_argument("--chunk", type=int, default=1 << 20)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--alpha", type=float, default=0.001)
+    args = parser.parse_args()
+
+    rows = []
+    for name in args.generators:
+        rate = throughput(name, int(args.speed_n), args.chunk)
+        battery = randtests.run(name, int(args.n), workers=args.workers, chunk=args.chunk)
+        results = battery.results()
+        worst_name, _, worst_p = min(results, key=lambda r: r[2])
+        ok = worst_p >= args.alpha / len(results)
+        rows.append((name, rate, bits_per_number(make(name, 1)) / 8, worst_name, worst_p, ok))
+        print(f"{name}: {rate / 1e6:.1f} млн чисел/с, худший тест {worst_name} p = {worst_p:.4f}")
+
+    print(f"\n{'генератор':<14} {'млн/с':>8} {'байт/число':>11} {'худший тест':>28} {'p':>8}  годен")
+    for name, rate, size, worst_name, worst_p, ok in rows:
+        print(f"{name:<14} {rate / 1e6:>8.1f} {size:>11g} {worst_name:>28} {worst_p:>8.4f}  {'да' if ok else 'нет'}")
+
+    good = [row for row in rows if row[5]]
+    if good:
+        best = max(good, key=lambda row: row[1])
+        print(f"\nСамый быстрый из годных: {best[0]} ({GENERATORS[best[0]][1]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import random
+
+import numpy as np
+
+from streams import LCGStream
+
+# Реестр равномерных генераторов с одним интерфейсом:
+#   gen = make("xoshiro256**", seed=1)
+#   gen.random(n)  -> float64 массив из [0, 1)
+# BITS — сколько бит состояния уходит на одно число (для отчёта о байтах на число).
+# Uniform(gen)() отдаёт по одному числу из буфера — замена random.random()
+# в циклах лабораторных.
+
+GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+TO_UNIT = 1.0 / 9007199254740992.0  # 2^-53
+
+
+def splitmix64(z):
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def lane_seeds(seed, lanes, words=1):
+    # Начальные состояния дорожек — подряд идущие выходы splitmix64 от seed,
+    # как советуют авторы xoshiro
+    counter = np.arange(1, lanes * words + 1, dtype=np.uint64) * GOLDEN + np.uint64(seed % 2**64)
+    return splitmix64(counter).reshape(words, lanes)
+
+
+def rotl(x, k):
+    return (x << np.uint64(k)) | (x >> np.uint64(64 - k))
+
+
+class LaneGenerator:
+    # 64-битный генератор, у которого LANES независимых копий шагают одним
+    # векторным шагом numpy; выход — дорожки подряд, остаток блока хранится
+    LANES = 4096
+    BITS = 64
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.seed_lanes(seed)
+        self.buffer = np.empty(0)
+
+    def random(self, n):
+        out = np.empty(n)
+        done = min(n, len(self.buffer))
+        out[:done] = self.buffer[:done]
+        self.buffer = self.buffer[done:]
+
+        blocks = -(-(n - done) // self.LANES)
+        if blocks:
+            raw = np.empty((blocks, self.LANES), np.uint64)
+            for i in range(blocks):
+                raw[i] = self.next_block()
+            values = (raw.ravel() >> np.uint64(11)) * TO_UNIT
+            out[done:] = values[:n - done]
+            self.buffer = values[n - done:]
+        return out
+
+
+class Xorshift64Star(LaneGenerator):
+    def seed_lanes(self, seed):
+        self.x = lane_seeds(seed, self.LANES)[0]
+        self.x[self.x == 0] = 1
+
+    def next_block(self):
+        x = self.x
+        x ^= x >> np.uint64(12)
+        x ^= x << np.uint64(25)
+        x ^= x >> np.uint64(27)
+        return x * np.uint64(0x2545F4914F6CDD1D)
+
+
+class Xoshiro256StarStar(LaneGenerator):
+    def seed_lanes(self, seed):
+        self.s = lane_seeds(seed, self.LANES, 4)
+
+    def next_block(self):
+        s0, s1, s2, s3 = self.s
+        result = rotl(s1 * np.uint64(5), 7) * np.uint64(9)
+        t = s1 << np.uint64(17)
+        s2 ^= s0
+        s3 ^= s1
+        s1 ^= s2
+        s0 ^= s3
+        s2 ^= t
+        s3[:] = rotl(s3, 45)
+        return result
+
+
+class NumpyGenerator:
+    # Битовые генераторы numpy через np.random.Generator
+    BITS = 64
+
+    def __init__(self, bit_generator, seed=None):
+        self.gen = np.random.Generator(bit_generator(seed))
+
+    def random(self, n):
+        return self.gen.random(n)
+
+
+class LCG:
+    BITS = 32
+
+    def __init__(self, seed=None):
+        self.stream = LCGStream(1 if seed is None else seed)
+
+    def random(self, n):
+        return self.stream.random(n)
+
+
+class PythonRandom:
+    # Ровно random.random(): два 32-битных слова Mersenne Twister на число,
+    # (a >> 5) * 2^26 + (b >> 6), деленное на 2^53, только без цикла Python
+    BITS = 64
+
+    def __init__(self, seed=None):
+        self.gen = random.Random(seed)
+
+    def random(self, n):
+        words = np.frombuffer(self.gen.getrandbits(64 * n).to_bytes(8 * n, "little"), np.uint32)
+        high = (words[0::2] >> 5).astype(np.float64)
+        low = (words[1::2] >> 6).astype(np.float64)
+        return (high * 67108864.0 + low) * TO_UNIT
+
+
+GENERATORS = {
+    "lcg": (LCG, "LCG из лабораторной 4, m = 2^32"),
+    "python": (PythonRandom, "random.random (Mersenne Twister)"),
+    "xorshift64*": (Xorshift64Star, f"xorshift64*, {LaneGenerator.LANES} дорожек"),
+    "xoshiro256**": (Xoshiro256StarStar, f"xoshiro256**, {LaneGenerator.LANES} дорожек"),
+    "pcg64": (lambda seed=None: NumpyGenerator(np.random.PCG64, seed), "numpy PCG64"),
+    "philox": (lambda seed=None: NumpyGenerator(np.random.Philox, seed), "numpy Philox 4x64"),
+    "mt19937": (lambda seed=None: NumpyGenerator(np.random.MT19937, seed), "numpy MT19937"),
+    "sfc64": (lambda seed=None: NumpyGenerator(np.random.SFC64, seed), "numpy SFC64"),
+}
+
+
+def make(name, seed=None):
+    if name not in GENERATORS:
+        raise ValueError(f"неизвестный генератор {name}, есть: {', '.join(GENERATORS)}")
+    return GENERATORS[name][0](seed)
+
+
+def bits_per_number(gen):
+    return getattr(gen, "BITS", 64)
+
+
+class Uniform:
+    # Вызов без аргументов — следующее число; числа берутся блоками по size
+    def __init__(self, gen, size=4096):
+        self.gen = make(gen) if isinstance(gen, str) else gen
+        self.size = size
+        self.block = []
+
+    def __call__(self):
+        if not self.block:
+            self.block = self.gen.random(self.size).tolist()
+            self.block.reverse()
+        return self.block.pop()
@@ -0,0 +1,117 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+# LCG x[n+1] = (A x[n] + C) mod M — тот же, что был в app.py, но массивами.
+# Переход на k шагов вперёд — тоже аффинное отображение x -> A_k x + C_k,
+# поэтому любой блок последовательности считается сразу от своего начала:
+#   x[s + j] = a_j * x[s] + c_j,  j = 1..BLOCK,
+# где таблица (a_j, c_j) вычисляется один раз. В uint32 умножение и сложение
+# идут по модулю 2^32 = M сами собой.
+#
+# Параметры удовлетворяют теореме Халла–Добелла (c нечётно, a - 1 делится на 4),
+# период полный — M. Поэтому сдвиг на k и на k mod M одно и то же, и отрицательный
+# сдвиг тоже допустим. step = (a, c) задаёт отображение одного шага: (A, C) для
+# самой последовательности или jump(n) для каждого n-го её члена.
+
+M = 2**32
+A = 1664525
+C = 1013904223
+
+BLOCK = 1 << 16
+CHUNK = 1 << 22
+
+
+def compose(first, second):
+    # Сначала first, потом second: x -> a2 (a1 x + c1) + c2
+    a1, c1 = first
+    a2, c2 = second
+    return (a1 * a2) % M, (a2 * c1 + c2) % M
+
+
+def jump(k, step=(A, C)):
+    # (A_k, C_k) за O(log k) возведением отображения в степень
+    result = (1, 0)
+    power = step
+    k %= M
+    while k:
+        if k & 1:
+            result = compose(result, power)
+        power = compose(power, power)
+        k >>= 1
+    return result
+
+
+def skip(state, k, step=(A, C)):
+    a, c = jump(k, step)
+    return (a * state + c) % M
+
+
+def offsets_table(n, step=(A, C)):
+    # a_j, c_j для j = 1..n удвоением: вторая половина — первая, сдвинутая на k шагов
+    a = np.empty(n, np.uint32)
+    c = np.empty(n, np.uint32)
+    a[0], c[0] = step
+    k = 1
+    while k < n:
+        m = min(k, n - k)
+        a_k, c_k = np.uint32(a[k - 1]), np.uint32(c[k - 1])
+        a[k:k + m] = a_k * a[:m]
+        c[k:k + m] = a_k * c[:m] + c_k
+        k += m
+    return a, c
+
+
+@lru_cache(maxsize=16)
+def table(step=(A, C)):
+    return offsets_table(BLOCK, step)
+
+
+def lcg_states(n, seed=1, out=None, step=(A, C)):
+    # Состояния x[1..n] после seed (сам seed не входит — как в lcg_random)
+    if out is None:
+        out = np.empty(n, np.uint32)
+    table_a, table_c = table(step)
+    state = seed % M
+    a_block, c_block = jump(BLOCK, step)
+    for start in range(0, n, BLOCK):
+        size = min(BLOCK, n - start)
+        np.multiply(table_a[:size], np.uint32(state), out=out[start:start + size])
+        out[start:start + size] += table_c[:size]
+        state = (a_block * state + c_block) % M
+    return out
+
+
+def to_unit(states):
+    # x / M точно в float64, как x / m в исходной функции
+    return states * (1.0 / M)
+
+
+def lcg_array(n, seed=1):
+    return to_unit(lcg_states(n, seed))
+
+
+def lcg_random(seed=1, n=100000):
+    return lcg_array(n, seed)
+
+
+def lcg_chunks(total, seed=1, chunk=CHUNK, workers=None):
+    # Последовательность длины total кусками по chunk в исходном порядке.
+    # Куски считаются в потоках (numpy отпускает GIL) от своих стартовых
+    # состояний; впереди потребителя не больше 2 * workers кусков.
+    workers = workers or os.cpu_count() or 1
+    a_chunk, c_chunk = jump(chunk)
+
+    with ThreadPoolExecutor(workers) as pool:
+        pending = deque()
+        state = seed % M
+        for start in range(0, total, chunk):
+            pending.append(pool.submit(lcg_array, min(chunk, total - start), state))
+            state = (a_chunk * state + c_chunk) % M
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,114 @@
+import math
+
+import numpy as np
+
+# Выборочные моменты за один проход без хранения выборки.
+# Состояние — n, среднее и центральные суммы M2, M3, M4; два состояния
+# складываются по формулам Пебэя (Pébay, 2008), поэтому куски выборки можно
+# считать по отдельности (в разных процессах) и объединить в конце.
+# Внутри куска среднее и отклонения считаются двумя проходами по массиву,
+# это устойчиво и не накапливает ошибку при огромных N.
+
+
+class Moments:
+    def __init__(self, bins=None, range=(0.0, 1.0)):
+        self.n = 0
+        self.mean = 0.0
+        self.M2 = 0.0
+        self.M3 = 0.0
+        self.M4 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+        # Гистограмма с фиксированными границами; значения вне range — below/above
+        self.edges = None if bins is None else np.linspace(range[0], range[1], bins + 1)
+        self.counts = None if bins is None else np.zeros(bins, np.int64)
+        self.below = 0
+        self.above = 0
+
+    def update(self, x):
+        x = np.asarray(x, dtype=np.float64).ravel()
+        if not len(x):
+            return self
+
+        part = Moments()
+        part.n = len(x)
+        part.mean = float(x.mean())
+        d = x - part.mean
+        d2 = d * d
+        part.M2 = float(d2.sum())
+        part.M3 = float(d2 @ d)
+        part.M4 = float(d2 @ d2)
+        part.min = float(x.min())
+        part.max = float(x.max())
+        self.merge_moments(part)
+
+        if self.counts is not None:
+            lo, hi = self.edges[0], self.edges[-1]
+            self.below += int(np.count_nonzero(x < lo))
+            self.above += int(np.count_nonzero(x > hi))
+            self.counts += np.histogram(x, self.edges)[0]
+        return self
+
+    def push(self, value):
+        # Одно значение — для циклов, где выборка получается по числу за раз
+        return self.update([value])
+
+    def merge(self, other):
+        if other.counts is not None or self.counts is not None:
+            if self.counts is None or other.counts is None or not np.array_equal(self.edges, other.edges):
+                raise ValueError("гистограммы с разными границами не объединяются")
+            self.counts += other.counts
+            self.below += other.below
+            self.above += other.above
+        return self.merge_moments(other)
+
+    def merge_moments(self, other):
+        na, nb = self.n, other.n
+        if nb == 0:
+            return self
+        if na == 0:
+            self.n, self.mean = other.n, other.mean
+            self.M2, self.M3, self.M4 = other.M2, other.M3, other.M4
+            self.min, self.max = other.min, other.max
+            return self
+
+        n = na + nb
+        delta = other.mean - self.mean
+        delta_n = delta / n
+        M2a, M3a = self.M2, self.M3
+
+        self.M4 += (other.M4 + delta * delta_n**3 * na * nb * (na * na - na * nb + nb * nb)
+                    + 6 * delta_n**2 * (na * na * other.M2 + nb * nb * M2a)
+                    + 4 * delta_n * (na * other.M3 - nb * M3a))
+        self.M3 += (other.M3 + delta * delta_n**2 * na * nb * (na - nb)
+                    + 3 * delta_n * (na * other.M2 - nb * M2a))
+        self.M2 += other.M2 + delta * delta_n * na * nb
+        self.mean += nb * delta_n
+        self.n = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def variance(self, ddof=0):
+        # ddof=0 — как np.var, ddof=1 — как statistics.variance
+        return self.M2 / (self.n - ddof) if self.n > ddof else math.nan
+
+    def std(self, ddof=0):
+        return math.sqrt(self.variance(ddof))
+
+    def skewness(self):
+        return math.sqrt(self.n) * self.M3 / self.M2**1.5 if self.M2 > 0 else math.nan
+
+    def kurtosis(self):
+        # Эксцесс: 0 для нормального, -1.2 для равномерного
+        return self.n * self.M4 / self.M2**2 - 3 if self.M2 > 0 else math.nan
+
+    def density(self):
+        # Как np.histogram(..., density=True) по значениям внутри range
+        inside = self.counts.sum()
+        return self.counts / (inside * np.diff(self.edges))
+
+    def __repr__(self):
+        return (f"Moments(n={self.n}, mean={self.mean:.6g}, var={self.variance():.6g}, "
+                f"skew={self.skewness():.4g}, kurt={self.kurtosis():.4g}, min={self.min:.6g}, max={self.max:.6g})")
@@ -0,0 +1,248 @@
+import argparse
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import stats
+
+from generators import GENERATORS, make
+from streams import LCGStream
+
+# Набор тестов равномерности, который читает числа кусками и хранит только
+# счётчики — память не зависит от объёма выборки:
+#   python randtests.py --source lcg python --n 1e9
+#
+# Состояния Battery складываются (merge), поэтому выборку можно разрезать
+# на последовательные сегменты и считать их в разных процессах. Пары, тройки
+# и спектральный тест берут числа группами; чтобы группы не рвались на стыках,
+# длина каждого сегмента, кроме последнего, кратна ALIGN.
+
+HIST_BITS = 20          # бинов гистограммы для KS: разрешение 1e-6
+CHI_BINS = 1024         # бинов для хи-квадрат (сумма соседних бинов гистограммы)
+PAIR_CELLS = 64         # 64 x 64 клетки для пар
+TRIPLE_CELLS = 16       # 16 x 16 x 16 клеток для троек
+LAGS = (1, 2, 3, 5, 10)
+DFT_BLOCK = 4096
+ALIGN = 2 * 3 * DFT_BLOCK
+
+
+class Battery:
+    def __init__(self):
+        self.n = 0
+        self.hist = np.zeros(1 << HIST_BITS, np.int64)
+        self.pairs = np.zeros(PAIR_CELLS**2, np.int64)
+        self.triples = np.zeros(TRIPLE_CELLS**3, np.int64)
+        self.grouped = 0            # чисел, прошедших через пары/тройки/спектр
+        self.pending = np.empty(0)  # хвост, не набравший ALIGN
+
+        # Серии выше/ниже 0.5
+        self.above = 0
+        self.runs = 0
+        self.first = None
+        self.last = None
+
+        # Автокорреляция: суммы u[i] u[i + lag], голова и хвост для стыков
+        self.lag_sums = np.zeros(len(LAGS))
+        self.lag_counts = np.zeros(len(LAGS), np.int64)
+        self.head = np.empty(0)
+        self.tail = np.empty(0)
+
+        # Спектральный тест (NIST): блоков и пиков ниже порога
+        self.blocks = 0
+        self.peaks = 0
+
+    def update(self, u):
+        u = np.asarray(u, dtype=np.float64)
+        if not len(u):
+            return self
+        self.n += len(u)
+        self.hist += np.bincount((u * (1 << HIST_BITS)).astype(np.int64), minlength=1 << HIST_BITS)
+
+        high = u >= 0.5
+        self.above += int(high.sum())
+        self.runs += 1 + int(np.count_nonzero(high[1:] != high[:-1]))
+        if self.last is not None and self.last == high[0]:
+            self.runs -= 1
+        if self.first is None:
+            self.first = bool(high[0])
+        self.last = bool(high[-1])
+
+        max_lag = max(LAGS)
+        joined = np.concatenate((self.tail, u))
+        skip = len(self.tail)
+        for i, lag in enumerate(LAGS):
+            # Пары, у которых второй член из нового куска
+            start = max(skip, lag)
+            self.lag_sums[i] += joined[start - lag:len(joined) - lag] @ joined[start:]
+            self.lag_counts[i] += len(joined) - start
+        self.tail = joined[-max_lag:]
+        if len(self.head) < max_lag:
+            self.head = np.concatenate((self.head, u[:max_lag - len(self.head)]))
+
+        grouped = np.concatenate((self.pending, u))
+        ready = len(grouped) // ALIGN * ALIGN
+        self.group_update(grouped[:ready])
+        self.pending = grouped[ready:]
+        return self
+
+    def group_update(self, u):
+        if not len(u):
+            return
+        self.grouped += len(u)
+
+        cells = (u * PAIR_CELLS).astype(np.int64).reshape(-1, 2)
+        self.pairs += np.bincount(cells[:, 0] * PAIR_CELLS + cells[:, 1], minlength=PAIR_CELLS**2)
+
+        cells = (u * TRIPLE_CELLS).astype(np.int64).reshape(-1, 3)
+        index = (cells[:, 0] * TRIPLE_CELLS + cells[:, 1]) * TRIPLE_CELLS + cells[:, 2]
+        self.triples += np.bincount(index, minlength=TRIPLE_CELLS**3)
+
+        # Биты u < 0.5 -> +-1, модуль ДПФ каждого блока сравнивается с порогом
+        signs = np.where(u < 0.5, -1.0, 1.0).reshape(-1, DFT_BLOCK)
+        spectrum = np.abs(np.fft.rfft(signs, axis=1))[:, :DFT_BLOCK // 2]
+        threshold = math.sqrt(math.log(1 / 0.05) * DFT_BLOCK)
+        self.blocks += len(signs)
+        self.peaks += int(np.count_nonzero(spectrum < threshold))
+
+    def merge(self, other):
+        # other — сегмент, идущий сразу после self
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        if len(self.pending):
+            raise ValueError(f"сегмент длины {self.n} не кратен {ALIGN}: группы разорвутся на стыке")
+        max_lag = max(LAGS)
+        if self.n < max_lag or other.n < max_lag:
+            raise ValueError(f"сегменты короче {max_lag} чисел")
+
+        self.n += other.n
+        self.hist += other.hist
+        self.pairs += other.pairs
+        self.triples += other.triples
+        self.grouped += other.grouped
+        self.pending = other.pending
+
+        self.above += other.above
+        self.runs += other.runs - (self.last == other.first)
+        self.last = other.last
+
+        # Пары автокорреляции через стык: хвост self и голова other
+        joined = np.concatenate((self.tail, other.head))
+        for i, lag in enumerate(LAGS):
+            self.lag_sums[i] += other.lag_sums[i] + joined[max_lag - lag:max_lag] @ joined[max_lag:max_lag + lag]
+            self.lag_counts[i] += other.lag_counts[i] + lag
+        self.tail = other.tail
+
+        self.blocks += other.blocks
+        self.peaks += other.peaks
+        return self
+
+    def results(self):
+        # Список (тест, статистика, p-значение)
+        n = self.n
+        out = []
+
+        chi = self.hist.reshape(CHI_BINS, -1).sum(axis=1)
+        out.append(chi_square("хи-квадрат, 1024 бина", chi))
+
+        cdf = np.cumsum(self.hist) / n
+        edges = np.arange(1, len(self.hist) + 1) / len(self.hist)
+        D = np.abs(cdf - edges).max()
+        out.append(("Колмогоров–Смирнов", D, stats.kstwo.sf(D, n)))
+
+        out.append(chi_square("пары 64x64", self.pairs))
+        out.append(chi_square("тройки 16^3", self.triples))
+
+        # Вальд–Вольфовиц: число серий выше/ниже 0.5
+        n1, n2 = self.above, n - self.above
+        mean = 2 * n1 * n2 / n + 1
+        var = (mean - 1) * (mean - 2) / (n - 1)
+        z = (self.runs - mean) / math.sqrt(var)
+        out.append(("серии выше/ниже 0.5", z, 2 * stats.norm.sf(abs(z))))
+
+        # Сумма m произведений u[i] u[i + lag]: среднее m/4, дисперсия 13m/144
+        # (7/144 от каждого члена и 2 * 1/48 от соседних, делящих множитель)
+        for i, lag in enumerate(LAGS):
+            m = self.lag_counts[i]
+            z = (self.lag_sums[i] - m / 4) / math.sqrt(13 * m / 144)
+            out.append((f"автокорреляция, лаг {lag}", z, 2 * stats.norm.sf(abs(z))))
+
+        if self.blocks:
+            expected = 0.95 * DFT_BLOCK / 2 * self.blocks
+            d = (self.peaks - expected) / math.sqrt(DFT_BLOCK * 0.95 * 0.05 / 4 * self.blocks)
+            out.append(("спектральный (ДПФ)", d, 2 * stats.norm.sf(abs(d))))
+        return out
+
+
+def chi_square(name, counts):
+    expected = counts.sum() / len(counts)
+    statistic = float(((counts - expected) ** 2).sum() / expected)
+    return name, statistic, stats.chi2.sf(statistic, len(counts) - 1)
+
+
+# ИСТОЧНИКИ ЧИСЕЛ
+def segment_chunks(source, seed, index, start, size, chunk):
+    if source == "lcg":
+        # Блок общей последовательности с позиции start
+        stream = LCGStream(seed, start, 1, size)
+        for done in range(0, size, chunk):
+            yield stream.random(min(chunk, size - done))
+    else:
+        # Прыжка вперёд у остальных генераторов реестра здесь нет:
+        # сегменты — независимо посеянные копии
+        gen = make(source, seed * 1_000_003 + index)
+        for done in range(0, size, chunk):
+            yield gen.random(min(chunk, size - done))
+
+
+def run_segment(source, seed, index, start, size, chunk):
+    battery = Battery()
+    for u in segment_chunks(source, seed, index, start, size, chunk):
+        battery.update(u)
+    return battery
+
+
+def run(source, total, seed=1, workers=None, chunk=1 << 20):
+    workers = workers or os.cpu_count() or 1
+    # По несколько сегментов на процесс для равномерной загрузки
+    segment = max(math.ceil(total / (4 * workers) / ALIGN) * ALIGN, ALIGN)
+    starts = list(range(0, total, segment))
+    sizes = [min(segment, total - start) for start in starts]
+
+    battery = Battery()
+    if workers == 1:
+        for index, (start, size) in enumerate(zip(starts, sizes)):
+            battery.merge(run_segment(source, seed, index, start, size, chunk))
+        return battery
+
+    with ProcessPoolExecutor(workers) as pool:
+        n = len(starts)
+        for part in pool.map(run_segment, [source] * n, [seed] * n, range(n), starts, sizes, [chunk] * n):
+            battery.merge(part)
+    return battery
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Потоковые тесты равномерности генераторов")
+    parser.add_argument("--source", nargs="+", default=["lcg", "python"], choices=list(GENERATORS))
+    parser.add_argument("--n", type=float, default=1e7, help="объём выборки")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk", type=int, default=1 << 20)
+    args = parser.parse_args()
+
+    for source in args.source:
+        start = time.perf_counter()
+        battery = run(source, int(args.n), args.seed, args.workers, args.chunk)
+        seconds = time.perf_counter() - start
+        print(f"\n{source}: n = {battery.n}, {seconds:.1f} с ({battery.n / seconds / 1e6:.1f} млн чисел/с)")
+        for name, statistic, p in battery.results():
+            print(f"  {name:<26} {statistic:>14.4f}   p = {p:.4f}")
+
+
+if __name__ == "__main__":
+    main()
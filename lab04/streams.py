@@ -0,0 +1,143 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+from lcg import M, jump, skip, lcg_states, to_unit
+
+# Независимые подпотоки одного LCG (параметры из lcg.py).
+# Поток — арифметическая прогрессия позиций базовой последовательности
+#   offset, offset + stride, offset + 2 stride, ...  (не больше length членов),
+# где позиция p — это lcg_random(seed)[p]. Два способа раздать потоки:
+#   split(n)    — n блоков подряд (stride тот же, offset сдвинут на длину блока);
+#   leapfrog(n) — чехарда: i-й поток берёт каждый n-й член, начиная с i-го.
+# Начало любого потока считается через jump за O(log n), без прогона
+# предыдущих чисел. Поток — просто числа, поэтому передаётся в процессы пула.
+
+
+class LCGStream:
+    def __init__(self, seed=1, offset=0, stride=1, length=None):
+        if length is None:
+            length = (M - 1 - offset) // stride + 1
+        if offset < 0 or stride < 1 or offset + (length - 1) * stride >= M:
+            raise ValueError("поток должен помещаться в один период генератора")
+        self.seed = seed % M
+        self.offset = offset
+        self.stride = stride
+        self.length = length
+        self.drawn = 0
+        self.step = jump(stride)
+        # Состояние перед очередным числом: отображение шага stride переводит
+        # его в x[offset + 1]. Сдвиг может быть отрицательным — период полный
+        self.state = skip(self.seed, offset + 1 - stride)
+
+    @property
+    def position(self):
+        return self.offset + self.drawn * self.stride
+
+    @property
+    def remaining(self):
+        return self.length - self.drawn
+
+    def states(self, n):
+        if n > self.remaining:
+            raise ValueError(f"в потоке осталось {self.remaining} чисел, запрошено {n}")
+        out = lcg_states(n, self.state, step=self.step)
+        if n:
+            self.state = int(out[-1])
+        self.drawn += n
+        return out
+
+    def random(self, n):
+        return to_unit(self.states(n))
+
+    def skip(self, n):
+        if n > self.remaining:
+            raise ValueError(f"в потоке осталось {self.remaining} чисел, пропуск {n}")
+        self.state = skip(self.state, n, self.step)
+        self.drawn += n
+
+    def split(self, n, length=None):
+        # n блоков подряд из оставшейся части потока
+        if length is None:
+            length = self.remaining // n
+        if n * length > self.remaining:
+            raise ValueError(f"{n} блоков по {length} не помещаются в {self.remaining} чисел")
+        return [LCGStream(self.seed, self.position + i * length * self.stride, self.stride, length)
+                for i in range(n)]
+
+    def leapfrog(self, n):
+        # i-й поток: члены i, i + n, i + 2n, ... оставшейся части потока
+        return [LCGStream(self.seed, self.position + i * self.stride, self.stride * n,
+                          (self.remaining - i + n - 1) // n)
+                for i in range(n)]
+
+    def __repr__(self):
+        return (f"LCGStream(seed={self.seed}, offset={self.offset}, stride={self.stride}, "
+                f"length={self.length}, drawn={self.drawn})")
+
+
+def disjoint(first, second):
+    # Позиции first: o1 + k1 s1, second: o2 + k2 s2. Совпадение требует
+    # o1 + k1 s1 = o2 + k2 s2 — решаем это диофантово уравнение
+    # и проверяем, попадает ли решение в допустимые k1, k2
+    if first.seed != second.seed:
+        # Разные seed — это сдвиги одной и той же последовательности полного периода
+        shift = position_of(first.seed, second.seed)
+        second = LCGStream(first.seed, (second.offset + shift) % M, second.stride, second.length)
+        if second.offset + (second.length - 1) * second.stride >= M:
+            return False  # поток переходит через конец периода — не проверяем
+
+    o1, s1, n1 = first.offset, first.stride, first.length
+    o2, s2, n2 = second.offset, second.stride, second.length
+    g = math.gcd(s1, s2)
+    if (o2 - o1) % g:
+        return True
+
+    # k1 s1 - k2 s2 = o2 - o1: частное решение и шаг по k1
+    step1 = s2 // g
+    k1 = ((o2 - o1) // g * pow(s1 // g, -1, step1)) % step1 if step1 > 1 else 0
+    # Первая позиция first, совпадающая с прогрессией second по модулю
+    # шага, дальше совпадения повторяются через lcm(s1, s2)
+    lcm = s1 * step1
+    start = max(o1, o2)
+    end = min(o1 + (n1 - 1) * s1, o2 + (n2 - 1) * s2)
+    p = o1 + k1 * s1
+    if p < start:
+        p += (start - p + lcm - 1) // lcm * lcm
+    return p > end
+
+
+def position_of(seed, state):
+    # Номер шага k, на котором x[k] = state, через двоичную запись k:
+    # младшие биты состояния LCG по модулю 2^32 зависят только от младших битов k
+    k = 0
+    for bit in range(32):
+        mask = (1 << (bit + 1)) - 1
+        if skip(seed, k) & mask != state & mask:
+            k |= 1 << bit
+    return k
+
+
+def check_disjoint(streams):
+    for i in range(len(streams)):
+        for j in range(i + 1, len(streams)):
+            if not disjoint(streams[i], streams[j]):
+                raise ValueError(f"потоки {streams[i]} и {streams[j]} пересекаются")
+    return True
+
+
+def worker_mean(stream, n):
+    values = stream.random(n)
+    return stream.offset, values.mean()
+
+
+def main():
+    # Пример: каждый процесс получает свой блок, результат не зависит от числа процессов
+    streams = LCGStream(seed=1).split(8, length=1_000_000)
+    check_disjoint(streams)
+    with ProcessPoolExecutor() as pool:
+        for offset, mean in pool.map(worker_mean, streams, [1_000_000] * len(streams)):
+            print(f"блок с позиции {offset:>9}: среднее {mean:.6f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
 import tkinter as tk
 from tkinter import ttk
-import random
 import math
+import os
+import sys
+
+# Генератор из реестра lab04/generators.py; "python" — прежний random.random()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lab04"))
+from generators import Uniform
+
+GENERATOR = "python"
+uniform = Uniform(GENERATOR)
 
 # =============================
 # ОКНО
@@ -52,7 +60,7 @@ result_label = tk.Label(frame1,
 result_label.pack(pady=80)
 
 def get_prediction(answers):
-    rand_val = random.random()  
+    rand_val = uniform()  
     A = 1                     
     k = 0                   
      
@@ -161,7 +169,7 @@ def fade_in(text, alpha=0):
 
 def show_prediction():
     global text_visible
-    rand_val = random.random()  
+    rand_val = uniform()  
     A = 1                    
     k = 0                       
     
@@ -4,14 +4,24 @@ import numpy as np
 from scipy import stats
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import random
+import os
+import sys
+
+# Моменты выборки считаются накопителем из lab04, случайные числа — генератором
+# из реестра lab04/generators.py ("python" — прежний random.random())
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lab04"))
+from moments import Moments
+from generators import Uniform
+
+GENERATOR = "python"
+uniform = Uniform(GENERATOR)
 
 
 Ns = [10, 100, 1000, 10000]
 
 
 def get_prediction(answers):
-    rand_val = random.random()
+    rand_val = uniform()
     A = 1
     k = 0
 
@@ -155,8 +165,9 @@ class App:
 
             samples = np.array([get_prediction(answers) for _ in range(N)])
 
-            m_emp = np.mean(samples)
-            d_emp = np.var(samples)
+            moments = Moments().update(samples)
+            m_emp = moments.mean
+            d_emp = moments.variance()
 
             err_m = abs(m_emp - m_teor) / abs(m_teor) * 100 if abs(m_teor) > 1e-9 else float('nan')
             err_d = abs(d_emp - d_teor) / d_teor * 100 if d_teor > 1e-9 else float('nan')
@@ -269,14 +280,15 @@ class App:
 
         for i, N in enumerate(Ns):
 
-            u1 = np.random.rand(N)
-            u2 = np.random.rand(N)
+            u1 = uniform.gen.random(N)
+            u2 = uniform.gen.random(N)
 
             samples = np.sqrt(-2 * np.log(u1)) * np.cos(2 * np.pi * u2)
             samples = samples * sigma + mu
 
-            m_emp = np.mean(samples)
-            d_emp = np.var(samples)
+            moments = Moments().update(samples)
+            m_emp = moments.mean
+            d_emp = moments.variance()
 
             if abs(mu) > 1e-9:
                 err_m = abs(m_emp - mu) / abs(mu) * 100